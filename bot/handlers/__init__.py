@@ -25,6 +25,9 @@ from bot.handlers.manage import (
 )
 from bot.handlers.buttons import (
     button_callback,
+    handle_conversation_timeout,
+    start_admin_notifier,
+    stop_admin_notifier,
     handle_add_to_feed_channel,
     handle_add_to_feed_description,
     handle_remove_from_feed_channel,
@@ -44,6 +47,7 @@ __all__ = [
     'start_command',
     'help_command',
     'handle_return_to_menu',
+    'handle_conversation_timeout',
     'news_command',
     'news_command_internal',
     'log_command',
@@ -60,6 +64,8 @@ __all__ = [
     'handle_news_count_input',
     'handle_new_folder_name',
     'button_callback',
+    'start_admin_notifier',
+    'stop_admin_notifier',
     'handle_add_to_feed_channel',
     'handle_add_to_feed_description',
     'handle_remove_from_feed_channel',
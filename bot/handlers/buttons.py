@@ -1,19 +1,27 @@
 # -*- coding: utf-8 -*-
 """Button callback handlers and channel owner forms."""
 
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, TelegramError
 from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.utils.config import ADMIN_CHAT_ID, MAX_SUMMARY_POSTS_LIMIT, MAX_NEWS_TIME_LIMIT_HOURS
 from bot.utils.validators import validate_channel_name
 from bot.utils.logger import setup_logging
-from bot.services import StorageService, ScraperService
+from bot.utils.markup import CachedInlineKeyboardMarkup
+from bot.utils.users import get_user_identity
 from bot.services import messenger as messenger_service
 
 # Setup logging
 logger, user_logger = setup_logging()
 
+from bot.handlers.shared import get_storage, get_scraper
+from bot.handlers.news import news_command_internal
+
 # Import conversation states
 from bot.handlers.manage import (
     WAITING_FOR_CHANNEL_ADD,
@@ -23,7 +31,9 @@ from bot.handlers.manage import (
     WAITING_FOR_NEW_FOLDER_NAME,
     format_time_display,
     send_channel_list,
-    create_folder_management_menu
+    create_folder_management_menu,
+    build_folder_management_menu,
+    get_user_view
 )
 
 # Channel owner form states
@@ -37,68 +47,148 @@ WAITING_FOR_RESTRICT_ACCESS_REASON = 11
 
 CHANNEL_FORMAT_HINT = "@channel01 или https://t.me/channel01"
 
+# user_data keys written by the channel owner forms
+_FORM_KEYS = ('form_channel', 'form_owner_name', 'form_hashtag', 'form_description', 'form_reason')
+
+# Admin form notifications are queued and delivered in batches by one worker task
+ADMIN_BATCH_MAX_FORMS = 10
+ADMIN_BATCH_WINDOW_SEC = 0.5
+ADMIN_FLUSH_TIMEOUT_SEC = 10.0
+ADMIN_SEND_ATTEMPTS = 3
+ADMIN_RETRY_DELAY_SEC = 1.0  # Multiplied by the attempt number
+_ADMIN_MESSAGE_LIMIT = 4096  # Telegram's maximum text message length
+_ADMIN_BATCH_SEPARATOR = "\n\n---\n\n"
+_admin_queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()  # None asks the worker to stop
+_admin_worker_task: Optional[asyncio.Task] = None
+
+# Admin notification text per channel owner form type
+_ADMIN_FORM_TEMPLATES = {
+    "add_to_feed": (
+        "📝 Новая заявка: Добавить канал в ленту\n\n"
+        "👤 От пользователя: {user_id} (@{username})\n"
+        "📢 Канал: {channel}\n"
+        "🏷️ Хештег: {hashtag}\n"
+        "📝 Описание: {description}\n"
+        "🕐 Дата: {submitted_at}"
+    ),
+    "remove_from_feed": (
+        "📝 Новая заявка: Удалить канал из ленты\n\n"
+        "👤 От пользователя: {user_id} (@{username})\n"
+        "📢 Канал: {channel}\n"
+        "❓ Причина: {reason}\n"
+        "🕐 Дата: {submitted_at}"
+    ),
+    "restrict_access": (
+        "📝 Новая заявка: Ограничить доступ\n\n"
+        "👤 От пользователя: {user_id} (@{username})\n"
+        "📢 Канал: {channel}\n"
+        "❓ Причина: {reason}\n"
+        "🕐 Дата: {submitted_at}"
+    ),
+}
+
+
+# Fixed reply texts, defined once at import time.
+_PLANS_MESSAGE = (
+    "Нажмите в главном меню <📰 Получить новости>\n\n"
+    "Ваш тариф: Free\n"
+    "3 /news в день\n\n"
+    "Тарифы:\n"
+    "• Free: 7 каналов | 2 папки | 5 постов | время 1ч-3д\n"
+    "• Plus: 15 каналов | 4 папки | 10 постов | время 1ч-7д\n"
+    "• Pro:  60 каналов | 15 папок | 15 постов | время 1ч-30д\n"
+    "* В тарифе Pro добавляйте по 10 каналов одновременно\n"
+    "• Enterprise: Хотите увеличить временной интервал или другие параметры, напишите @fast_news_ai_admin"
+)
+
+_CHANNEL_OWNERS_MESSAGE = (
+    "⭐️ Для владельцев каналов\n\n"
+    "Для владельцев каналов мы предлагаем возможность добавить каналы в ленту новостей.\n\n"
+    "Выберите действие:"
+)
+
+_NEWS_FEED_MESSAGE = 'Здесь будут каналы по темам "скоро" ... '
+
+
+# Static keyboards are built once at import time and shared by every handler call.
+_MAIN_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("✨ Начать", callback_data='start_plans')],
+    [InlineKeyboardButton("📰 Получить новости", callback_data='get_news')],
+    [InlineKeyboardButton("📁 Управление папками", callback_data='manage_folders')],
+    [InlineKeyboardButton("➕ Добавить канал", callback_data='add_channel'), InlineKeyboardButton("➖ Удалить канал", callback_data='remove_channel')],
+    [InlineKeyboardButton("📋 Список каналов", callback_data='list_channels')],
+    [InlineKeyboardButton("⏰ Время", callback_data='time_interval'), InlineKeyboardButton("📊 Новости", callback_data='news_count')],
+    [InlineKeyboardButton("🔥Лента новостей", callback_data='news_feed')],
+    [InlineKeyboardButton("⭐️ Для владельцев каналов", callback_data='for_channel_owners')],
+    [InlineKeyboardButton("🗑️ Удалить все каналы", callback_data='remove_all')]
+])
+
+_RETURN_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_CHANNEL_OWNER_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Добавить канал в ленту", callback_data='add_to_feed')],
+    [InlineKeyboardButton("➖ Удалить канал из ленты", callback_data='remove_from_feed')],
+    [InlineKeyboardButton("🚫 Ограничить доступ", callback_data='restrict_access')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_PLANS_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("Подключить Plus (499 руб/месяц)", callback_data='connect_plus')],
+    [InlineKeyboardButton("Подключить Pro (1999 руб/месяц)", callback_data='connect_pro')],
+    [InlineKeyboardButton("Подключить Enterprise", callback_data='connect_enterprise')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_HASHTAG_KEYBOARD = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("#it", callback_data='hashtag:it'),
+     InlineKeyboardButton("#tech", callback_data='hashtag:tech')],
+    [InlineKeyboardButton("#news", callback_data='hashtag:news'),
+     InlineKeyboardButton("#business", callback_data='hashtag:business')],
+    [InlineKeyboardButton("#crypto", callback_data='hashtag:crypto'),
+     InlineKeyboardButton("#science", callback_data='hashtag:science')],
+    [InlineKeyboardButton("#ai", callback_data='hashtag:ai'),
+     InlineKeyboardButton("#startup", callback_data='hashtag:startup')],
+    [InlineKeyboardButton("#fintech", callback_data='hashtag:fintech'),
+     InlineKeyboardButton("#web3", callback_data='hashtag:web3')]
+])
+
 
 def create_main_menu():
-    """Create the main menu keyboard with folder management."""
-    keyboard = [
-        [InlineKeyboardButton("✨ Начать", callback_data='start_plans')],
-        [InlineKeyboardButton("📰 Получить новости", callback_data='get_news')],
-        [InlineKeyboardButton("📁 Управление папками", callback_data='manage_folders')],
-        [InlineKeyboardButton("➕ Добавить канал", callback_data='add_channel'), InlineKeyboardButton("➖ Удалить канал", callback_data='remove_channel')],
-        [InlineKeyboardButton("📋 Список каналов", callback_data='list_channels')],
-        [InlineKeyboardButton("⏰ Время", callback_data='time_interval'), InlineKeyboardButton("📊 Новости", callback_data='news_count')],
-        [InlineKeyboardButton("🔥Лента новостей", callback_data='news_feed')],
-        [InlineKeyboardButton("⭐️ Для владельцев каналов", callback_data='for_channel_owners')],
-        [InlineKeyboardButton("🗑️ Удалить все каналы", callback_data='remove_all')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return the main menu keyboard with folder management."""
+    return _MAIN_MENU
 
 
 def create_return_menu_button():
-    """Create keyboard with only return to menu button."""
-    keyboard = [
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard with only return to menu button."""
+    return _RETURN_MENU
 
 
 def create_channel_owner_menu():
-    """Create keyboard for channel owner options."""
-    keyboard = [
-        [InlineKeyboardButton("➕ Добавить канал в ленту", callback_data='add_to_feed')],
-        [InlineKeyboardButton("➖ Удалить канал из ленты", callback_data='remove_from_feed')],
-        [InlineKeyboardButton("🚫 Ограничить доступ", callback_data='restrict_access')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard for channel owner options."""
+    return _CHANNEL_OWNER_MENU
 
 
 def create_plans_menu():
-    """Create keyboard for subscription plans."""
-    keyboard = [
-        [InlineKeyboardButton("Подключить Plus (499 руб/месяц)", callback_data='connect_plus')],
-        [InlineKeyboardButton("Подключить Pro (1999 руб/месяц)", callback_data='connect_pro')],
-        [InlineKeyboardButton("Подключить Enterprise", callback_data='connect_enterprise')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard for subscription plans."""
+    return _PLANS_MENU
 
 
 def create_hashtag_keyboard():
-    """Create keyboard with 10 popular hashtags for channel categorization."""
-    keyboard = [
-        [InlineKeyboardButton("#it", callback_data='hashtag_it'),
-         InlineKeyboardButton("#tech", callback_data='hashtag_tech')],
-        [InlineKeyboardButton("#news", callback_data='hashtag_news'),
-         InlineKeyboardButton("#business", callback_data='hashtag_business')],
-        [InlineKeyboardButton("#crypto", callback_data='hashtag_crypto'),
-         InlineKeyboardButton("#science", callback_data='hashtag_science')],
-        [InlineKeyboardButton("#ai", callback_data='hashtag_ai'),
-         InlineKeyboardButton("#startup", callback_data='hashtag_startup')],
-        [InlineKeyboardButton("#fintech", callback_data='hashtag_fintech'),
-         InlineKeyboardButton("#web3", callback_data='hashtag_web3')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard with 10 popular hashtags for channel categorization."""
+    return _HASHTAG_KEYBOARD
+
+
+def _clear_form_data(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Remove the channel owner form fields from user_data, keeping anything else."""
+    for key in _FORM_KEYS:
+        context.user_data.pop(key, None)
+
+
+async def handle_conversation_timeout(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Drop form data left behind by a conversation that timed out."""
+    _clear_form_data(context)
 
 
 async def validate_and_store_username(update: Update, context: ContextTypes.DEFAULT_TYPE, validation_msg=None) -> bool:
@@ -113,575 +203,699 @@ async def validate_and_store_username(update: Update, context: ContextTypes.DEFA
     Returns:
         bool: True if username exists, False otherwise (with error message sent)
     """
-    user_username = update.effective_user.username
+    user = update.effective_user
+    user_username = user.username
 
     if user_username:
         owner_name = f"@{user_username}"
         context.user_data['form_owner_name'] = owner_name
-        user_logger.info(
-            f"User_{update.effective_user.id} (@{user_username}) "
-            f"auto-filled owner name {owner_name}"
-        )
+        user_logger.info("User_%s (@%s) auto-filled owner name %s", user.id, user_username, owner_name)
         return True
 
     # User doesn't have username
-    reply_markup = create_return_menu_button()
     error_msg = (
         "❌ У вас не установлен username в Telegram.\n"
         "Пожалуйста, установите username в настройках Telegram и попробуйте снова."
     )
 
     if validation_msg:
-        await validation_msg.edit_text(error_msg, reply_markup=reply_markup)
+        await validation_msg.edit_text(error_msg, reply_markup=_RETURN_MENU)
     else:
-        await messenger_service.send_text(update.effective_chat.id, error_msg, reply_markup=reply_markup)
+        await messenger_service.send_text(update.effective_chat.id, error_msg, reply_markup=_RETURN_MENU)
 
-    context.user_data.clear()
+    _clear_form_data(context)
     return False
 
 
-async def send_form_to_admin(context: ContextTypes.DEFAULT_TYPE, form_type: str, form_data: dict):
-    """Send form submission to admin via Telegram."""
+async def send_form_to_admin(
+    context: ContextTypes.DEFAULT_TYPE,
+    form_type: str,
+    form_data: dict,
+    now: Optional[datetime] = None,
+):
+    """Queue a form submission for delivery to the admin chat.
+
+    Returns True once the form is queued; delivery happens in the background.
+    """
     if not ADMIN_CHAT_ID:
         logger.error("ADMIN_CHAT_ID not set in environment variables")
         return False
 
-    try:
-        if form_type == "add_to_feed":
-            message = (
-                f"📝 Новая заявка: Добавить канал в ленту\n\n"
-                f"👤 От пользователя: {form_data['user_id']} (@{form_data['username']})\n"
-                f"📢 Канал: {form_data['channel']}\n"
-                f"🏷️ Хештег: {form_data['hashtag']}\n"
-                f"📝 Описание: {form_data['description']}\n"
-                f"🕐 Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-            )
-        elif form_type == "remove_from_feed":
-            message = (
-                f"📝 Новая заявка: Удалить канал из ленты\n\n"
-                f"👤 От пользователя: {form_data['user_id']} (@{form_data['username']})\n"
-                f"📢 Канал: {form_data['channel']}\n"
-                f"❓ Причина: {form_data.get('reason', 'Не указана')}\n"
-                f"🕐 Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-            )
-        elif form_type == "restrict_access":
-            message = (
-                f"📝 Новая заявка: Ограничить доступ\n\n"
-                f"👤 От пользователя: {form_data['user_id']} (@{form_data['username']})\n"
-                f"📢 Канал: {form_data['channel']}\n"
-                f"❓ Причина: {form_data.get('reason', 'Не указана')}\n"
-                f"🕐 Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-            )
-        else:
-            return False
+    template = _ADMIN_FORM_TEMPLATES.get(form_type)
+    if template is None:
+        return False
 
-        await messenger_service.send_text(ADMIN_CHAT_ID, message)
+    try:
+        message = template.format_map({
+            'reason': 'Не указана',
+            **form_data,
+            'submitted_at': (now or datetime.now()).strftime('%d.%m.%Y %H:%M'),
+        })
+        _admin_queue.put_nowait(message)
+        _ensure_admin_worker()
         return True
     except Exception as e:
-        logger.error(f"Error sending form to admin: {e}", exc_info=True)
+        logger.error("Error queueing form for admin: %s", e, exc_info=True)
         return False
 
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle button callbacks."""
-    storage = StorageService()
-    scraper = ScraperService()
+def _ensure_admin_worker() -> None:
+    """Start the admin notification worker if it is not already running."""
+    global _admin_worker_task
+    if _admin_worker_task is None or _admin_worker_task.done():
+        _admin_worker_task = asyncio.create_task(_admin_worker())
 
-    query = update.callback_query
-    await query.answer()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+def start_admin_notifier() -> None:
+    """Start delivering queued admin notifications (called on bot startup)."""
+    _ensure_admin_worker()
 
-    if query.data == 'return_to_menu':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Return to menu' button")
-        welcome_message = (
-            "Выберите действие из меню:"
-        )
-        reply_markup = create_main_menu()
-        await messenger_service.send_text(update.effective_chat.id, welcome_message, reply_markup=reply_markup)
-        return ConversationHandler.END
 
-    elif query.data == 'start_plans':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Start' button")
-        reply_markup = create_plans_menu()
-
-        plans_message = (
-            "Нажмите в главном меню <📰 Получить новости>\n\n" 
-            "Ваш тариф: Free\n"
-            "3 /news в день\n\n"
-            "Тарифы:\n"
-            "• Free: 7 каналов | 2 папки | 5 постов | время 1ч-3д\n"
-            "• Plus: 15 каналов | 4 папки | 10 постов | время 1ч-7д\n"
-            "• Pro:  60 каналов | 15 папок | 15 постов | время 1ч-30д\n"
-            "* В тарифе Pro добавляйте по 10 каналов одновременно\n"
-            "• Enterprise: Хотите увеличить временной интервал или другие параметры, напишите @fast_news_ai_admin"
-        )
+async def stop_admin_notifier() -> None:
+    """Send any queued admin notifications and stop the worker (called on bot shutdown)."""
+    global _admin_worker_task
+    task = _admin_worker_task
+    _admin_worker_task = None
+    if task is None or task.done():
+        return
 
-        await messenger_service.send_text(update.effective_chat.id, plans_message, reply_markup=reply_markup)
-        return ConversationHandler.END
+    _admin_queue.put_nowait(None)
+    # asyncio.wait (unlike wait_for) leaves the worker running on timeout, so it is
+    # cancelled explicitly and whatever it could not send is logged
+    done, _ = await asyncio.wait({task}, timeout=ADMIN_FLUSH_TIMEOUT_SEC)
+    if done:
+        return
 
-    elif query.data == 'add_channel':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Add channel' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "➕ Добавить канал\n\n"
-            "Введите 1 канал в строку ввода.\n"
-            "Пример: @channel01 или https://t.me/channel01"
-        )
-        return WAITING_FOR_CHANNEL_ADD
+    logger.error("Admin notification queue not flushed within %ss", ADMIN_FLUSH_TIMEOUT_SEC)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
 
-    elif query.data == 'remove_channel':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Remove channel' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "➖ Удалить канал\n\n"
-            "Введите 1 канал в строку ввода.\n"
-            "Пример: @channel01 или https://t.me/channel01"
-        )
-        return WAITING_FOR_CHANNEL_REMOVE
+    unsent = []
+    while not _admin_queue.empty():
+        message = _admin_queue.get_nowait()
+        if message is not None:
+            unsent.append(message)
+    _log_dropped_admin_messages(unsent, "bot stopped")
 
-    elif query.data == 'list_channels':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Channel List' button")
-        # Send immediate feedback
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, "⏳ Загружаю список каналов...")
 
-        reply_markup = create_return_menu_button()
+def _log_dropped_admin_messages(messages: List[str], reason: str) -> None:
+    """Log undelivered admin notifications in full so the forms can be recovered from the log."""
+    for message in messages:
+        logger.error("Admin notification not delivered (%s):\n%s", reason, message)
 
-        await send_channel_list(update, user_id, reply_markup=reply_markup, message_obj=query.message, processing_msg=processing_msg)
 
-        return ConversationHandler.END
+async def _collect_admin_batch() -> Tuple[List[str], bool]:
+    """
+    Wait for one queued form, then gather more for up to ADMIN_BATCH_WINDOW_SEC.
 
-    elif query.data == 'time_interval':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Time Interval' button")
-        current_time = await storage.get_user_time_limit(user_id)
+    Returns:
+        The collected messages and whether a stop was requested.
+    """
+    first = await _admin_queue.get()
+    if first is None:
+        return [], True
+
+    batch = [first]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + ADMIN_BATCH_WINDOW_SEC
+    while len(batch) < ADMIN_BATCH_MAX_FORMS:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            message = await asyncio.wait_for(_admin_queue.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+        if message is None:
+            return batch, True
+        batch.append(message)
+    return batch, False
+
+
+def _split_admin_batch(batch: List[str]) -> List[str]:
+    """Join queued forms into as few messages as fit Telegram's length limit."""
+    chunks = []
+    current = ""
+    for message in batch:
+        message = message[:_ADMIN_MESSAGE_LIMIT]
+        if not current:
+            current = message
+        elif len(current) + len(_ADMIN_BATCH_SEPARATOR) + len(message) <= _ADMIN_MESSAGE_LIMIT:
+            current += _ADMIN_BATCH_SEPARATOR + message
+        else:
+            chunks.append(current)
+            current = message
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def _send_to_admin_with_retry(text: str) -> bool:
+    """Send one admin message, retrying failed sends up to ADMIN_SEND_ATTEMPTS times."""
+    for attempt in range(1, ADMIN_SEND_ATTEMPTS + 1):
+        try:
+            await messenger_service.send_text(ADMIN_CHAT_ID, text)
+            return True
+        except Exception as e:
+            logger.warning("Error sending forms to admin (attempt %s/%s): %s", attempt, ADMIN_SEND_ATTEMPTS, e)
+            if attempt < ADMIN_SEND_ATTEMPTS:
+                await asyncio.sleep(ADMIN_RETRY_DELAY_SEC * attempt)
+    return False
 
-        # Format display: hours or days
-        display = format_time_display(current_time)
 
-        await messenger_service.send_text(update.effective_chat.id, 
-            f"⏰ Текущий временной диапазон: {display}\n\n"
-            f"Чтобы изменить диапазон, введите:\n"
-            f"• Количество часов (например: 24)\n"
-            f"• Количество дней с буквой 'd' (например: 7d)\n"
-            f"Максимум: {MAX_NEWS_TIME_LIMIT_HOURS} часов (7 дней)"
-        )
-        return WAITING_FOR_TIME_INTERVAL
+async def _admin_worker() -> None:
+    """Deliver queued admin notifications, one message per burst of forms."""
+    while True:
+        batch, stopping = await _collect_admin_batch()
+        pending = _split_admin_batch(batch)
+        try:
+            while pending:
+                if not await _send_to_admin_with_retry(pending[0]):
+                    _log_dropped_admin_messages(pending[:1], "send failed")
+                pending.pop(0)
+        except asyncio.CancelledError:
+            _log_dropped_admin_messages(pending, "bot stopped")
+            raise
+        if stopping:
+            return
 
-    elif query.data == 'news_count':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Number of News' button")
-        current_max = await storage.get_user_max_posts(user_id)
-        await messenger_service.send_text(update.effective_chat.id, 
-            f"📊 Текущее количество новостей: {current_max}\n\n"
-            f"Чтобы изменить, введите количество (например: 10)\n"
-            f"Максимум: {MAX_SUMMARY_POSTS_LIMIT} новостей"
-        )
-        return WAITING_FOR_NEWS_COUNT
-
-    elif query.data == 'get_news':
-        from bot.handlers.news import news_command_internal
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Get News' button")
-        # Send immediate feedback before processing
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, 
-            "⏳ Начинаю сбор новостей...\n"
-            "Это займёт несколько секунд."
-        )
-        # Call the news command function
-        await news_command_internal(update, context, processing_msg)
-        return ConversationHandler.END
 
-    elif query.data == 'news_feed':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'News Feed' button")
-        reply_markup = create_return_menu_button()
-        message_text = 'Здесь будут каналы по темам "скоро" ... '
-        await messenger_service.send_text(update.effective_chat.id, message_text, reply_markup=reply_markup)
-        return ConversationHandler.END
+# ============================================================================
+# Button Callback Handlers
+# ============================================================================
 
-    elif query.data == 'for_channel_owners':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'For channel owners' button")
-        reply_markup = create_channel_owner_menu()
-        message_text = (
-            "⭐️ Для владельцев каналов\n\n"
-            "Для владельцев каналов мы предлагаем возможность добавить каналы в ленту новостей.\n\n"
-            "Выберите действие:"
-        )
-        await messenger_service.send_text(update.effective_chat.id, message_text, reply_markup=reply_markup)
-        return ConversationHandler.END
+async def _edit_or_send(update: Update, text: str, reply_markup=None):
+    """Show text in place of the clicked message, sending a new one if it cannot be edited.
 
-    elif query.data == 'add_to_feed':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Add to feed' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "➕ Добавить канал в ленту\n\n"
-            "Введите название канала:\n"
-            "Пример: @channels01 или https://t.me/channels01"
-        )
-        return WAITING_FOR_ADD_TO_FEED_CHANNEL
+    The edit goes to the Bot API directly rather than through messenger_service,
+    whose rate-limited queue only carries new messages (send_text). An edit is
+    one call per click in the user's own chat, like query.answer() and the
+    processing-message edits in the manage and news handlers. The fallback send
+    goes through the queue as usual.
+    """
+    query = update.callback_query
+    try:
+        return await query.edit_message_text(text, reply_markup=reply_markup)
+    except BadRequest as exc:
+        if "not modified" in str(exc).lower():
+            return query.message
+        logger.debug("Could not edit callback message, sending a new one: %s", exc)
+        return await messenger_service.send_text(update.effective_chat.id, text, reply_markup=reply_markup)
+
+
+async def _handle_return_to_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the main menu again."""
+    user_logger.info("User_%s (@%s) clicked 'Return to menu' button", user_id, username)
+    welcome_message = (
+        "Выберите действие из меню:"
+    )
+    await _edit_or_send(update, welcome_message, _MAIN_MENU)
+    return ConversationHandler.END
 
-    elif query.data == 'remove_from_feed':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Remove from feed' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "➖ Удалить канал из ленты\n\n"
-            "Введите название канала:\n"
-            "Пример: @channels01 или https://t.me/channels01"
-        )
-        return WAITING_FOR_REMOVE_FROM_FEED_CHANNEL
 
-    elif query.data == 'restrict_access':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Restrict access' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "🚫 Ограничить доступ\n\n"
-            "Введите название канала:\n"
-            "Пример: @channels01 или https://t.me/channels01"
-        )
-        return WAITING_FOR_RESTRICT_ACCESS_CHANNEL
+async def _handle_start_plans(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the current plan and available subscription plans."""
+    user_logger.info("User_%s (@%s) clicked 'Start' button", user_id, username)
+    await _edit_or_send(update, _PLANS_MESSAGE, _PLANS_MENU)
+    return ConversationHandler.END
 
-    elif query.data.startswith('hashtag_'):
-        # Handle hashtag selection
-        hashtag = '#' + query.data.replace('hashtag_', '')
-        context.user_data['form_hashtag'] = hashtag
-        user_logger.info(f"User_{user_id} (@{username}) selected hashtag {hashtag}")
-        await messenger_service.send_text(update.effective_chat.id, 
-            f"✅ Выбран хештег: {hashtag}\n\n"
-            f"Напишите краткое описание вашего канала (максимум 30 символов):"
-        )
-        return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
 
-    elif query.data == 'remove_all':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Delete All Channels' button")
-        # Send immediate feedback
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, "⏳ Удаляю все каналы...")
+async def _handle_add_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Ask for a channel to add to the active folder."""
+    user_logger.info("User_%s (@%s) clicked 'Add channel' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "➕ Добавить канал\n\n"
+        "Введите 1 канал в строку ввода.\n"
+        "Пример: @channel01 или https://t.me/channel01"
+    )
+    return WAITING_FOR_CHANNEL_ADD
 
-        channels = await storage.get_user_channels(user_id)
-        reply_markup = create_return_menu_button()
 
-        if not channels:
-            await processing_msg.edit_text(
-                "📭 У вас нет добавленных каналов.",
-                reply_markup=reply_markup
-            )
-        else:
-            channel_count = len(channels)
-            await storage.set_user_channels(user_id, [])
-            await processing_msg.edit_text(
-                f"🗑️ Все каналы ({channel_count}) были удалены.",
-                reply_markup=reply_markup
-            )
-        return ConversationHandler.END
+async def _handle_remove_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Ask for a channel to remove from the active folder."""
+    user_logger.info("User_%s (@%s) clicked 'Remove channel' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "➖ Удалить канал\n\n"
+        "Введите 1 канал в строку ввода.\n"
+        "Пример: @channel01 или https://t.me/channel01"
+    )
+    return WAITING_FOR_CHANNEL_REMOVE
 
-    elif query.data in ['connect_plus', 'connect_pro', 'connect_enterprise']:
-        plan_name = query.data.replace('connect_', '').capitalize()
-        user_logger.info(f"User_{user_id} (@{username}) clicked '{plan_name}' plan button")
 
-        # Save subscription request to JSON
-        await storage.save_plan_subscription(user_id, username, plan_name)
+async def _handle_list_channels(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show channels from all folders."""
+    user_logger.info("User_%s (@%s) clicked 'Channel List' button", user_id, username)
 
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(update.effective_chat.id, 
-            "Спасибо за ваш выбор! Сейчас мы добавляем способ оплаты\n"
-            "Когда появиться возможность оплатить, мы отправим Вам сообщение",
-            reply_markup=reply_markup
-        )
-        return ConversationHandler.END
+    # Replace the clicked menu with the list instead of sending a progress message first
+    message = update.callback_query.message
+    await send_channel_list(update, user_id, reply_markup=_RETURN_MENU, message_obj=message, processing_msg=message)
 
-    elif query.data == 'manage_folders':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Manage Folders' button")
-        # Send immediate feedback
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, "⏳ Загружаю папки...")
+    return ConversationHandler.END
 
-        active_folder = await storage.get_active_folder_name(user_id)
-        folders = await storage.get_user_folders(user_id)
-        folder_count = len(folders)
 
-        reply_markup = await create_folder_management_menu(user_id)
-        await processing_msg.edit_text(
-            f"📁 Управление папками\n\n"
-            f"✅ Активная папка: {active_folder}\n"
-            f"📊 Всего папок: {folder_count}\n\n"
-            f"Выберите папку для переключения или создайте новую:",
-            reply_markup=reply_markup
-        )
-        return ConversationHandler.END
+async def _handle_time_interval(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the current news time range and ask for a new one."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) clicked 'Time Interval' button", user_id, username)
+    current_time = await storage.get_user_time_limit(user_id)
 
-    elif query.data.startswith('switch_folder:'):
-        folder_name = query.data.replace('switch_folder:', '')
-        user_logger.info(f"User_{user_id} (@{username}) switching to folder '{folder_name}'")
-
-        # Send immediate feedback
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, f"⏳ Переключаюсь на папку {folder_name}...")
-
-        if await storage.switch_active_folder(user_id, folder_name):
-            reply_markup = await create_folder_management_menu(user_id)
-            await processing_msg.edit_text(
-                f"✅ Переключено на папку: {folder_name}\n\n"
-                f"Теперь все операции с каналами будут применяться к этой папке.\n"
-                f"Команда /news будет показывать новости из каналов этой папки.",
-                reply_markup=reply_markup
-            )
-        else:
-            await processing_msg.edit_text("❌ Не удалось переключить папку.")
-        return ConversationHandler.END
+    # Format display: hours or days
+    display = format_time_display(current_time)
 
-    elif query.data == 'create_folder':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Create Folder' button")
-        await messenger_service.send_text(update.effective_chat.id, 
-            "➕ Создание новой папки\n\n"
-            "Введите название новой папки (максимум 10 символов):"
-        )
-        return WAITING_FOR_NEW_FOLDER_NAME
-
-    elif query.data == 'delete_folder':
-        user_logger.info(f"User_{user_id} (@{username}) clicked 'Delete Folder' button")
-        folders = await storage.get_user_folders(user_id)
-
-        if len(folders) == 1:
-            reply_markup = await create_folder_management_menu(user_id)
-            await messenger_service.send_text(update.effective_chat.id, 
-                "❌ Нельзя удалить единственную папку.",
-                reply_markup=reply_markup
-            )
-            return ConversationHandler.END
-
-        # Create buttons for each folder
-        keyboard = []
-        for folder_name in folders.keys():
-            keyboard.append([InlineKeyboardButton(f"🗑️ {folder_name}", callback_data=f'confirm_delete_folder:{folder_name}')])
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в меню", callback_data='manage_folders')])
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await messenger_service.send_text(update.effective_chat.id, 
-            "🗑️ Удаление папки\n\n"
-            "Выберите папку для удаления.\n"
-            "⚠️ Все каналы в папке будут удалены:",
-            reply_markup=reply_markup
-        )
-        return ConversationHandler.END
+    await messenger_service.send_text(update.effective_chat.id, 
+        f"⏰ Текущий временной диапазон: {display}\n\n"
+        f"Чтобы изменить диапазон, введите:\n"
+        f"• Количество часов (например: 24)\n"
+        f"• Количество дней с буквой 'd' (например: 7d)\n"
+        f"Максимум: {MAX_NEWS_TIME_LIMIT_HOURS} часов (7 дней)"
+    )
+    return WAITING_FOR_TIME_INTERVAL
 
-    elif query.data.startswith('confirm_delete_folder:'):
-        folder_name = query.data.replace('confirm_delete_folder:', '')
-        user_logger.info(f"User_{user_id} (@{username}) confirming delete folder '{folder_name}'")
 
-        # Send immediate feedback
-        processing_msg = await messenger_service.send_text(update.effective_chat.id, f"⏳ Удаляю папку {folder_name}...")
+async def _handle_news_count(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the current number of news summaries and ask for a new one."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) clicked 'Number of News' button", user_id, username)
+    current_max = await storage.get_user_max_posts(user_id)
+    await messenger_service.send_text(update.effective_chat.id, 
+        f"📊 Текущее количество новостей: {current_max}\n\n"
+        f"Чтобы изменить, введите количество (например: 10)\n"
+        f"Максимум: {MAX_SUMMARY_POSTS_LIMIT} новостей"
+    )
+    return WAITING_FOR_NEWS_COUNT
 
-        if await storage.delete_folder(user_id, folder_name):
-            reply_markup = await create_folder_management_menu(user_id)
-            await processing_msg.edit_text(
-                f"✅ Папка '{folder_name}' удалена.",
-                reply_markup=reply_markup
-            )
-        else:
-            reply_markup = await create_folder_management_menu(user_id)
-            await processing_msg.edit_text(
-                f"❌ Не удалось удалить папку '{folder_name}'.",
-                reply_markup=reply_markup
-            )
-        return ConversationHandler.END
 
+async def _handle_get_news(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Collect and send news for the active folder."""
+    user_logger.info("User_%s (@%s) clicked 'Get News' button", user_id, username)
+    # Send immediate feedback before processing
+    processing_msg = await messenger_service.send_text(update.effective_chat.id, 
+        "⏳ Начинаю сбор новостей...\n"
+        "Это займёт несколько секунд."
+    )
+    # Call the news command function
+    await news_command_internal(update, context, processing_msg)
     return ConversationHandler.END
 
 
-# ============================================================================
-# Channel Owner Form Handlers
-# ============================================================================
+async def _handle_news_feed(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the news feed placeholder."""
+    user_logger.info("User_%s (@%s) clicked 'News Feed' button", user_id, username)
+    await _edit_or_send(update, _NEWS_FEED_MESSAGE, _RETURN_MENU)
+    return ConversationHandler.END
 
-async def handle_add_to_feed_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle channel name input for add to feed form."""
-    scraper = ScraperService()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    raw_channel = (update.message.text or "").strip()
+async def _handle_for_channel_owners(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the channel owner options menu."""
+    user_logger.info("User_%s (@%s) clicked 'For channel owners' button", user_id, username)
+    await _edit_or_send(update, _CHANNEL_OWNERS_MESSAGE, _CHANNEL_OWNER_MENU)
+    return ConversationHandler.END
 
-    try:
-        channel = validate_channel_name(raw_channel)
-    except ValueError:
-        await messenger_service.send_text(
-            update.effective_chat.id,
-            f"❌ Некорректный формат канала. Используйте {CHANNEL_FORMAT_HINT}.\n"
-            "Попробуйте еще раз:"
-        )
-        return WAITING_FOR_ADD_TO_FEED_CHANNEL
 
-    # Validate channel accessibility (same as main Add Channel feature)
-    is_valid, error_msg = await scraper.validate_channel_access(channel, update)
+async def _handle_add_to_feed(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Start the add-to-feed form."""
+    user_logger.info("User_%s (@%s) clicked 'Add to feed' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "➕ Добавить канал в ленту\n\n"
+        "Введите название канала:\n"
+        "Пример: @channels01 или https://t.me/channels01"
+    )
+    return WAITING_FOR_ADD_TO_FEED_CHANNEL
 
-    if not is_valid:
-        logger.warning(f"User {user_id} tried to add inaccessible channel {channel}: {error_msg}")
-        return WAITING_FOR_ADD_TO_FEED_CHANNEL
 
-    # Store channel in context
-    context.user_data['form_channel'] = channel
-    user_logger.info(f"User_{user_id} (@{username}) entered channel {channel} for add to feed")
+async def _handle_remove_from_feed(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Start the remove-from-feed form."""
+    user_logger.info("User_%s (@%s) clicked 'Remove from feed' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "➖ Удалить канал из ленты\n\n"
+        "Введите название канала:\n"
+        "Пример: @channels01 или https://t.me/channels01"
+    )
+    return WAITING_FOR_REMOVE_FROM_FEED_CHANNEL
 
-    # Get user's Telegram username and auto-fill
-    if not await validate_and_store_username(update, context):
-        return ConversationHandler.END
 
-    owner_name = context.user_data['form_owner_name']
+async def _handle_restrict_access(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Start the restrict-access form."""
+    user_logger.info("User_%s (@%s) clicked 'Restrict access' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "🚫 Ограничить доступ\n\n"
+        "Введите название канала:\n"
+        "Пример: @channels01 или https://t.me/channels01"
+    )
+    return WAITING_FOR_RESTRICT_ACCESS_CHANNEL
 
-    # Show confirmation message and proceed to hashtag selection
-    reply_markup = create_hashtag_keyboard()
+
+async def _handle_hashtag(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str, tag: str):
+    """Store the selected hashtag and ask for the channel description."""
+    hashtag = '#' + tag
+    context.user_data['form_hashtag'] = hashtag
+    user_logger.info("User_%s (@%s) selected hashtag %s", user_id, username, hashtag)
     await messenger_service.send_text(update.effective_chat.id, 
-        f"Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем рассмотреть вашу заявку!\n\n"
-        f"Выберите хештег для вашего канала:",
-        reply_markup=reply_markup
+        f"✅ Выбран хештег: {hashtag}\n\n"
+        f"Напишите краткое описание вашего канала (максимум 30 символов):"
     )
-    return WAITING_FOR_ADD_TO_FEED_HASHTAG
+    return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
 
 
-async def handle_add_to_feed_description(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle description input for add to feed form."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    description = update.message.text.strip()
+async def _handle_remove_all(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Remove all channels from the active folder."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) clicked 'Delete All Channels' button", user_id, username)
+    channels = await storage.get_user_channels(user_id)
 
-    # Validate description length
-    if len(description) > 30:
-        await messenger_service.send_text(update.effective_chat.id, 
-            f"❌ Описание слишком длинное ({len(description)} символов)\n"
-            f"Максимум: 30 символов\n\n"
-            f"Попробуйте еще раз:"
-        )
-        return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
+    # The outcome of a destructive action is sent as its own message; the main menu stays usable
+    if not channels:
+        await messenger_service.send_text(update.effective_chat.id, "📭 У вас нет добавленных каналов.", reply_markup=_RETURN_MENU)
+    else:
+        channel_count = len(channels)
+        await storage.set_user_channels(user_id, [])
+        await messenger_service.send_text(update.effective_chat.id, f"🗑️ Все каналы ({channel_count}) были удалены.", reply_markup=_RETURN_MENU)
+    return ConversationHandler.END
 
-    if len(description) < 5:
-        await messenger_service.send_text(update.effective_chat.id, 
-            "❌ Описание слишком короткое (минимум 5 символов)\n"
-            "Попробуйте еще раз:"
-        )
-        return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
 
-    # Store description in context
-    context.user_data['form_description'] = description
-    user_logger.info(f"User_{user_id} (@{username}) entered description for add to feed")
+async def _handle_connect_plan(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Record a subscription request for the selected plan."""
+    storage = get_storage()
+    plan_name = update.callback_query.data.replace('connect_', '').capitalize()
+    user_logger.info("User_%s (@%s) clicked '%s' plan button", user_id, username, plan_name)
 
-    # Prepare form data
-    form_data = {
-        'user_id': user_id,
-        'username': username,
-        'channel': context.user_data.get('form_channel'),
-        'hashtag': context.user_data.get('form_hashtag'),
-        'description': description
-    }
+    # Save subscription request to JSON
+    await storage.save_plan_subscription(user_id, username, plan_name)
 
-    # Send form to admin
-    success = await send_form_to_admin(context, "add_to_feed", form_data)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "Спасибо за ваш выбор! Сейчас мы добавляем способ оплаты\n"
+        "Когда появиться возможность оплатить, мы отправим Вам сообщение",
+        reply_markup=_RETURN_MENU
+    )
+    return ConversationHandler.END
 
-    if success:
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(update.effective_chat.id, 
-            "✅ Ваша заявка отправлена на рассмотрение!\n\n"
-            "Мы свяжемся с вами в ближайшее время.",
+
+async def _handle_manage_folders(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the folder management menu."""
+    user_logger.info("User_%s (@%s) clicked 'Manage Folders' button", user_id, username)
+    folder_names, active_folder = await get_user_view(user_id)
+    folder_count = len(folder_names)
+
+    reply_markup = build_folder_management_menu(folder_names, active_folder)
+    await _edit_or_send(
+        update,
+        f"📁 Управление папками\n\n"
+        f"✅ Активная папка: {active_folder}\n"
+        f"📊 Всего папок: {folder_count}\n\n"
+        f"Выберите папку для переключения или создайте новую:",
+        reply_markup=reply_markup
+    )
+    return ConversationHandler.END
+
+
+async def _handle_switch_folder(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str, folder_name: str):
+    """Make the selected folder active."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) switching to folder '%s'", user_id, username, folder_name)
+
+    if await storage.switch_active_folder(user_id, folder_name):
+        reply_markup = await create_folder_management_menu(user_id)
+        await _edit_or_send(
+            update,
+            f"✅ Переключено на папку: {folder_name}\n\n"
+            f"Теперь все операции с каналами будут применяться к этой папке.\n"
+            f"Команда /news будет показывать новости из каналов этой папки.",
             reply_markup=reply_markup
         )
     else:
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(update.effective_chat.id, 
-            "❌ Произошла ошибка при отправке заявки.\n"
-            "Попробуйте позже или свяжитесь с нами: @fast_news_ai_admin",
-            reply_markup=reply_markup
-        )
-
-    # Clear form data
-    context.user_data.clear()
+        # The folder menu is edited in place, so keep its buttons on failure too
+        reply_markup = await create_folder_management_menu(user_id)
+        await _edit_or_send(update, "❌ Не удалось переключить папку.", reply_markup=reply_markup)
     return ConversationHandler.END
 
 
-async def handle_remove_from_feed_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle channel name input for remove from feed form."""
-    storage = StorageService()
+async def _handle_create_folder(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Ask for a name for the new folder."""
+    user_logger.info("User_%s (@%s) clicked 'Create Folder' button", user_id, username)
+    await messenger_service.send_text(update.effective_chat.id, 
+        "➕ Создание новой папки\n\n"
+        "Введите название новой папки (максимум 10 символов):"
+    )
+    return WAITING_FOR_NEW_FOLDER_NAME
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    raw_channel = (update.message.text or "").strip()
 
-    try:
-        channel = validate_channel_name(raw_channel)
-    except ValueError:
-        await messenger_service.send_text(
-            update.effective_chat.id,
-            f"❌ Некорректный формат канала. Используйте {CHANNEL_FORMAT_HINT}.\n"
-            "Попробуйте еще раз:"
-        )
-        return WAITING_FOR_REMOVE_FROM_FEED_CHANNEL
+async def _handle_delete_folder(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str):
+    """Show the folder deletion menu."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) clicked 'Delete Folder' button", user_id, username)
+    folders = await storage.get_user_folders(user_id)
 
-    # Check if channel is in feed
-    if not await storage.check_channel_in_feed(channel):
-        reply_markup = create_return_menu_button()
+    if len(folders) == 1:
+        reply_markup = await create_folder_management_menu(user_id)
         await messenger_service.send_text(update.effective_chat.id, 
-            f"❌ Канал {channel} не найден в ленте.",
+            "❌ Нельзя удалить единственную папку.",
             reply_markup=reply_markup
         )
-        context.user_data.clear()
         return ConversationHandler.END
 
-    # Store channel in context
-    context.user_data['form_channel'] = channel
-    user_logger.info(f"User_{user_id} (@{username}) entered channel {channel} for remove from feed")
+    # Create buttons for each folder
+    keyboard = []
+    for folder_name in folders.keys():
+        keyboard.append([InlineKeyboardButton(f"🗑️ {folder_name}", callback_data=f'confirm_delete_folder:{folder_name}')])
+    keyboard.append([InlineKeyboardButton("🏠 Вернуться в меню", callback_data='manage_folders')])
 
-    # Get user's Telegram username and auto-fill
-    if not await validate_and_store_username(update, context):
-        return ConversationHandler.END
-
-    owner_name = context.user_data['form_owner_name']
-
-    # Show confirmation message and proceed to reason
+    reply_markup = InlineKeyboardMarkup(keyboard)
     await messenger_service.send_text(update.effective_chat.id, 
-        f"✅ Канал: {channel}\n\n"
-        f"Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем обработать вашу заявку!\n\n"
-        f"Укажите причину (необязательно):\n"
-        f"Или введите 'пропустить' чтобы пропустить этот шаг."
+        "🗑️ Удаление папки\n\n"
+        "Выберите папку для удаления.\n"
+        "⚠️ Все каналы в папке будут удалены:",
+        reply_markup=reply_markup
     )
-    return WAITING_FOR_REMOVE_FROM_FEED_REASON
-
-
-async def handle_remove_from_feed_reason(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle reason input for remove from feed form."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    reason = update.message.text.strip()
+    return ConversationHandler.END
 
-    # Check if user wants to skip
-    if reason.lower() in ['пропустить', 'skip']:
-        reason = None
 
-    user_logger.info(f"User_{user_id} (@{username}) entered reason for remove from feed")
+async def _handle_confirm_delete_folder(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str, folder_name: str):
+    """Delete the selected folder."""
+    storage = get_storage()
+    user_logger.info("User_%s (@%s) confirming delete folder '%s'", user_id, username, folder_name)
 
-    # Prepare form data
-    form_data = {
-        'user_id': user_id,
-        'username': username,
-        'channel': context.user_data.get('form_channel'),
-        'reason': reason
-    }
-
-    # Send form to admin
-    success = await send_form_to_admin(context, "remove_from_feed", form_data)
-
-    if success:
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(update.effective_chat.id, 
-            "✅ Ваша заявка отправлена на рассмотрение!\n\n"
-            "Мы свяжемся с вами в ближайшее время.",
+    if await storage.delete_folder(user_id, folder_name):
+        reply_markup = await create_folder_management_menu(user_id)
+        await _edit_or_send(
+            update,
+            f"✅ Папка '{folder_name}' удалена.",
             reply_markup=reply_markup
         )
     else:
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(update.effective_chat.id, 
-            "❌ Произошла ошибка при отправке заявки.\n"
-            "Попробуйте позже или свяжитесь с нами: @fast_news_ai_admin",
+        reply_markup = await create_folder_management_menu(user_id)
+        await _edit_or_send(
+            update,
+            f"❌ Не удалось удалить папку '{folder_name}'.",
             reply_markup=reply_markup
         )
+    return ConversationHandler.END
 
-    # Clear form data
-    context.user_data.clear()
+
+# Buttons with fixed callback data, looked up by exact match
+_BUTTON_HANDLERS = {
+    'return_to_menu': _handle_return_to_menu,
+    'start_plans': _handle_start_plans,
+    'add_channel': _handle_add_channel,
+    'remove_channel': _handle_remove_channel,
+    'list_channels': _handle_list_channels,
+    'time_interval': _handle_time_interval,
+    'news_count': _handle_news_count,
+    'get_news': _handle_get_news,
+    'news_feed': _handle_news_feed,
+    'for_channel_owners': _handle_for_channel_owners,
+    'add_to_feed': _handle_add_to_feed,
+    'remove_from_feed': _handle_remove_from_feed,
+    'restrict_access': _handle_restrict_access,
+    'remove_all': _handle_remove_all,
+    'connect_plus': _handle_connect_plan,
+    'connect_pro': _handle_connect_plan,
+    'connect_enterprise': _handle_connect_plan,
+    'manage_folders': _handle_manage_folders,
+    'create_folder': _handle_create_folder,
+    'delete_folder': _handle_delete_folder,
+}
+
+# Buttons whose callback data is "<prefix>:<value>", looked up by prefix
+_PREFIX_BUTTON_HANDLERS = {
+    'hashtag': _handle_hashtag,
+    'switch_folder': _handle_switch_folder,
+    'confirm_delete_folder': _handle_confirm_delete_folder,
+}
+
+# Hashtag buttons already in users' chats still carry "hashtag_<tag>"
+_LEGACY_HASHTAG_PREFIX = 'hashtag_'
+
+
+# Loading toasts shown on the button press itself (keyed by callback data or prefix)
+_BUTTON_ANSWER_TEXTS = {
+    'list_channels': "⏳ Загружаю список каналов...",
+    'remove_all': "⏳ Удаляю все каналы...",
+    'manage_folders': "⏳ Загружаю папки...",
+    'switch_folder': "⏳ Переключаю папку...",
+    'confirm_delete_folder': "⏳ Удаляю папку...",
+}
+
+# Slow buttons that must not run twice at once for the same user
+_SINGLE_FLIGHT_BUTTONS = frozenset({'get_news', 'list_channels', 'manage_folders', 'remove_all'})
+
+# (user_id, callback data) pairs whose handler is still running
+_buttons_in_flight: Set[Tuple[int, str]] = set()
+
+
+async def _answer_quietly(query, text=None) -> None:
+    """Answer a callback query, logging instead of raising if Telegram rejects it."""
+    try:
+        await query.answer(text)
+    except TelegramError as exc:
+        logger.debug("Could not answer callback query: %s", exc)
+
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle button callbacks."""
+    query = update.callback_query
+
+    user_id, username = get_user_identity(update)
+
+    handler = _BUTTON_HANDLERS.get(query.data)
+    if handler is not None:
+        single_flight = query.data in _SINGLE_FLIGHT_BUTTONS
+        in_flight_key = (user_id, query.data)
+        if single_flight:
+            # Repeated clicks while the first one is still processing only get a toast
+            if in_flight_key in _buttons_in_flight:
+                await _answer_quietly(query, "⏳ Уже обрабатываю предыдущий запрос...")
+                return ConversationHandler.END
+            _buttons_in_flight.add(in_flight_key)
+
+        # Answer the query while the handler runs instead of waiting for the round-trip
+        ack = asyncio.create_task(_answer_quietly(query, _BUTTON_ANSWER_TEXTS.get(query.data)))
+        try:
+            return await handler(update, context, user_id, username)
+        finally:
+            if single_flight:
+                _buttons_in_flight.discard(in_flight_key)
+            await ack
+
+    prefix, separator, value = query.data.partition(':')
+    if not separator and query.data.startswith(_LEGACY_HASHTAG_PREFIX):
+        # Hashtag keyboard sent before the switch to "hashtag:<tag>"
+        prefix, separator, value = 'hashtag', ':', query.data[len(_LEGACY_HASHTAG_PREFIX):]
+    prefix_handler = _PREFIX_BUTTON_HANDLERS.get(prefix) if separator else None
+    if prefix_handler is not None:
+        ack = asyncio.create_task(_answer_quietly(query, _BUTTON_ANSWER_TEXTS.get(prefix)))
+        try:
+            return await prefix_handler(update, context, user_id, username, value)
+        finally:
+            await ack
+
+    await query.answer()
     return ConversationHandler.END
 
 
-async def handle_restrict_access_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle channel name input for restrict access form."""
-    scraper = ScraperService()
+# ============================================================================
+# Channel Owner Form Handlers
+# ============================================================================
+
+# Users whose channel access check is still running
+_channel_checks_in_flight: Set[int] = set()
+
+
+async def _check_channel_access(update: Update, user_id: int, channel: str) -> Optional[bool]:
+    """Validate that the bot can read a channel, one check per user at a time.
+
+    Returns None (after telling the user) if the same user sent another channel
+    while the previous check was still running.
+    """
+    if user_id in _channel_checks_in_flight:
+        await messenger_service.send_text(update.effective_chat.id, "⏳ Уже проверяю предыдущий канал...")
+        return None
+
+    _channel_checks_in_flight.add(user_id)
+    try:
+        is_valid, error_msg = await get_scraper().validate_channel_access(channel, update)
+    finally:
+        _channel_checks_in_flight.discard(user_id)
+
+    if not is_valid:
+        logger.warning("User %s tried to add inaccessible channel %s: %s", user_id, channel, error_msg)
+    return is_valid
+
+
+async def _check_channel_in_feed(update: Update, user_id: int, channel: str) -> bool:
+    """Check that a channel is in the feed, telling the user if it is not."""
+    if await get_storage().check_channel_in_feed(channel):
+        return True
+    await messenger_service.send_text(update.effective_chat.id,
+        f"❌ Канал {channel} не найден в ленте.",
+        reply_markup=_RETURN_MENU
+    )
+    return False
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+
+@dataclass(frozen=True)
+class FormStep:
+    """Channel input step of a channel owner form.
+
+    check returns True to continue, False to stop with rejected_state, or None
+    to keep the current state (the check already told the user why).
+    """
+
+    retry_state: int
+    check: Callable[[Update, int, str], Awaitable[Optional[bool]]]
+    rejected_state: int
+    next_state: int
+    log_label: str
+    confirmation_template: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+
+
+ADD_TO_FEED_STEP = FormStep(
+    retry_state=WAITING_FOR_ADD_TO_FEED_CHANNEL,
+    check=_check_channel_access,
+    rejected_state=WAITING_FOR_ADD_TO_FEED_CHANNEL,
+    next_state=WAITING_FOR_ADD_TO_FEED_HASHTAG,
+    log_label="add to feed",
+    confirmation_template=(
+        "Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем рассмотреть вашу заявку!\n\n"
+        "Выберите хештег для вашего канала:"
+    ),
+    reply_markup=_HASHTAG_KEYBOARD,
+)
+
+REMOVE_FROM_FEED_STEP = FormStep(
+    retry_state=WAITING_FOR_REMOVE_FROM_FEED_CHANNEL,
+    check=_check_channel_in_feed,
+    rejected_state=ConversationHandler.END,
+    next_state=WAITING_FOR_REMOVE_FROM_FEED_REASON,
+    log_label="remove from feed",
+    confirmation_template=(
+        "✅ Канал: {channel}\n\n"
+        "Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем обработать вашу заявку!\n\n"
+        "Укажите причину (необязательно):\n"
+        "Или введите 'пропустить' чтобы пропустить этот шаг."
+    ),
+)
+
+RESTRICT_ACCESS_STEP = FormStep(
+    retry_state=WAITING_FOR_RESTRICT_ACCESS_CHANNEL,
+    check=_check_channel_access,
+    rejected_state=WAITING_FOR_RESTRICT_ACCESS_CHANNEL,
+    next_state=WAITING_FOR_RESTRICT_ACCESS_REASON,
+    log_label="restrict access",
+    confirmation_template=(
+        "Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем рассмотреть вашу заявку!\n\n"
+        "Укажите причину (необязательно):\n"
+        "Или введите 'пропустить' чтобы пропустить этот шаг."
+    ),
+)
+
+
+async def _handle_channel_step(update: Update, context: ContextTypes.DEFAULT_TYPE, step: FormStep):
+    """Validate the channel a user typed into a form and move on to the next step."""
+    user_id, username = get_user_identity(update)
     raw_channel = (update.message.text or "").strip()
 
     try:
@@ -692,18 +906,20 @@ async def handle_restrict_access_channel(update: Update, context: ContextTypes.D
             f"❌ Некорректный формат канала. Используйте {CHANNEL_FORMAT_HINT}.\n"
             "Попробуйте еще раз:"
         )
-        return WAITING_FOR_RESTRICT_ACCESS_CHANNEL
+        return step.retry_state
 
-    # Validate channel accessibility (same as main Add Channel feature)
-    is_valid, error_msg = await scraper.validate_channel_access(channel, update)
-
-    if not is_valid:
-        logger.warning(f"User {user_id} tried to add inaccessible channel {channel}: {error_msg}")
-        return WAITING_FOR_RESTRICT_ACCESS_CHANNEL
+    passed = await step.check(update, user_id, channel)
+    if passed is None:
+        # Another check is running for this user; keep the current state
+        return None
+    if not passed:
+        if step.rejected_state == ConversationHandler.END:
+            _clear_form_data(context)
+        return step.rejected_state
 
     # Store channel in context
     context.user_data['form_channel'] = channel
-    user_logger.info(f"User_{user_id} (@{username}) entered channel {channel} for restrict access")
+    user_logger.info("User_%s (@%s) entered channel %s for %s", user_id, username, channel, step.log_label)
 
     # Get user's Telegram username and auto-fill
     if not await validate_and_store_username(update, context):
@@ -711,53 +927,112 @@ async def handle_restrict_access_channel(update: Update, context: ContextTypes.D
 
     owner_name = context.user_data['form_owner_name']
 
-    # Show confirmation message and proceed to reason
-    await messenger_service.send_text(update.effective_chat.id, 
-        f"Ваше имя ({owner_name}) должно совпадать с именем в описании канала, иначе мы не сможем рассмотреть вашу заявку!\n\n"
-        f"Укажите причину (необязательно):\n"
-        f"Или введите 'пропустить' чтобы пропустить этот шаг."
+    # Show confirmation message and proceed to the next step
+    send_kwargs = {} if step.reply_markup is None else {'reply_markup': step.reply_markup}
+    await messenger_service.send_text(update.effective_chat.id,
+        step.confirmation_template.format(channel=channel, owner_name=owner_name),
+        **send_kwargs
     )
-    return WAITING_FOR_RESTRICT_ACCESS_REASON
+    return step.next_state
 
 
-async def handle_restrict_access_reason(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle reason input for restrict access form."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+async def _submit_form(update: Update, context: ContextTypes.DEFAULT_TYPE, form_type: str, form_data: dict):
+    """Send a completed form to the admin, confirm to the user and end the conversation."""
+    success = await send_form_to_admin(context, form_type, form_data)
+
+    if success:
+        await messenger_service.send_text(update.effective_chat.id,
+            "✅ Ваша заявка отправлена на рассмотрение!\n\n"
+            "Мы свяжемся с вами в ближайшее время.",
+            reply_markup=_RETURN_MENU
+        )
+    else:
+        await messenger_service.send_text(update.effective_chat.id,
+            "❌ Произошла ошибка при отправке заявки.\n"
+            "Попробуйте позже или свяжитесь с нами: @fast_news_ai_admin",
+            reply_markup=_RETURN_MENU
+        )
+
+    # Clear form data
+    _clear_form_data(context)
+    return ConversationHandler.END
+
+
+async def _handle_reason_step(update: Update, context: ContextTypes.DEFAULT_TYPE, form_type: str, log_label: str):
+    """Handle the optional reason that completes the remove/restrict forms."""
+    user_id, username = get_user_identity(update)
     reason = update.message.text.strip()
 
     # Check if user wants to skip
     if reason.lower() in ['пропустить', 'skip']:
         reason = None
 
-    user_logger.info(f"User_{user_id} (@{username}) entered reason for restrict access")
+    user_logger.info("User_%s (@%s) entered reason for %s", user_id, username, log_label)
 
-    # Prepare form data
     form_data = {
         'user_id': user_id,
         'username': username,
         'channel': context.user_data.get('form_channel'),
         'reason': reason
     }
+    return await _submit_form(update, context, form_type, form_data)
 
-    # Send form to admin
-    success = await send_form_to_admin(context, "restrict_access", form_data)
 
-    if success:
-        reply_markup = create_return_menu_button()
+async def handle_add_to_feed_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle channel name input for add to feed form."""
+    return await _handle_channel_step(update, context, ADD_TO_FEED_STEP)
+
+
+async def handle_add_to_feed_description(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle description input for add to feed form."""
+    user_id, username = get_user_identity(update)
+    description = update.message.text.strip()
+
+    # Validate description length
+    if len(description) > 30:
         await messenger_service.send_text(update.effective_chat.id, 
-            "✅ Ваша заявка отправлена на рассмотрение!\n\n"
-            "Мы свяжемся с вами в ближайшее время.",
-            reply_markup=reply_markup
+            f"❌ Описание слишком длинное ({len(description)} символов)\n"
+            f"Максимум: 30 символов\n\n"
+            f"Попробуйте еще раз:"
         )
-    else:
-        reply_markup = create_return_menu_button()
+        return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
+
+    if len(description) < 5:
         await messenger_service.send_text(update.effective_chat.id, 
-            "❌ Произошла ошибка при отправке заявки.\n"
-            "Попробуйте позже или свяжитесь с нами: @fast_news_ai_admin",
-            reply_markup=reply_markup
+            "❌ Описание слишком короткое (минимум 5 символов)\n"
+            "Попробуйте еще раз:"
         )
+        return WAITING_FOR_ADD_TO_FEED_DESCRIPTION
 
-    # Clear form data
-    context.user_data.clear()
-    return ConversationHandler.END
+    # Store description in context
+    context.user_data['form_description'] = description
+    user_logger.info("User_%s (@%s) entered description for add to feed", user_id, username)
+
+    form_data = {
+        'user_id': user_id,
+        'username': username,
+        'channel': context.user_data.get('form_channel'),
+        'hashtag': context.user_data.get('form_hashtag'),
+        'description': description
+    }
+    return await _submit_form(update, context, "add_to_feed", form_data)
+
+
+async def handle_remove_from_feed_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle channel name input for remove from feed form."""
+    return await _handle_channel_step(update, context, REMOVE_FROM_FEED_STEP)
+
+
+async def handle_remove_from_feed_reason(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle reason input for remove from feed form."""
+    return await _handle_reason_step(update, context, "remove_from_feed", "remove from feed")
+
+
+async def handle_restrict_access_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle channel name input for restrict access form."""
+    return await _handle_channel_step(update, context, RESTRICT_ACCESS_STEP)
+
+
+async def handle_restrict_access_reason(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle reason input for restrict access form."""
+    return await _handle_reason_step(update, context, "restrict_access", "restrict access")
@@ -3,19 +3,45 @@
 
 Provides /log command for admins to view weekly user activity statistics.
 """
+import asyncio
 import os
 import logging
+import re
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from bot.services import messenger as messenger_service
+from bot.utils.config import ADMIN_CHAT_ID_BACKUP, ADMIN_CHAT_ID_BACKUP_INT
 
 logger = logging.getLogger(__name__)
 
+# bot_user.log is read backwards in blocks of this size to find the start of the stats window
+_LOG_SEEK_BLOCK_SIZE = 256 * 1024
+
+# "YYYY-MM-DD HH:MM:SS,mmm - User_ID (@username) action" -> (timestamp, user ID, action)
+_LOG_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+ - User_(\d+) \(@[^)]*\) (.*)$')
+
+# Parsed statistics are reused for repeated /log calls while the log is unchanged
+_LOG_CACHE_TTL_SEC = 60.0
+_LOG_CACHE: Optional[Tuple[float, Path, float, Dict]] = None  # (cached_at, path, log mtime, stats)
+
+
+def _load_admin_id() -> Tuple[Optional[int], Optional[str]]:
+    """Return the /log admin ID, or the error to show when it is misconfigured."""
+    if not ADMIN_CHAT_ID_BACKUP:
+        return None, "⚠️ Команда /log не настроена (ADMIN_CHAT_ID_BACKUP не указан в конфигурации)."
+    if ADMIN_CHAT_ID_BACKUP_INT is None:
+        return None, "⚠️ Ошибка конфигурации: ADMIN_CHAT_ID_BACKUP имеет неверный формат."
+    return ADMIN_CHAT_ID_BACKUP_INT, None
+
+
+# Resolved once at import; the environment does not change while the bot runs
+_ADMIN_ID, _ADMIN_ERROR = _load_admin_id()
+
 
 async def _send_reply(
     update: Update,
@@ -53,25 +79,11 @@ async def log_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     user_id = update.effective_user.id
 
     # Access control - only ADMIN_CHAT_ID_BACKUP can use this command
-    admin_chat_id_backup = os.getenv('ADMIN_CHAT_ID_BACKUP')
-
-    if not admin_chat_id_backup:
-        await _send_reply(
-            update,
-            "⚠️ Команда /log не настроена (ADMIN_CHAT_ID_BACKUP не указан в конфигурации)."
-        )
+    if _ADMIN_ERROR:
+        await _send_reply(update, _ADMIN_ERROR)
         return
 
-    try:
-        admin_id = int(admin_chat_id_backup)
-    except ValueError:
-        await _send_reply(
-            update,
-            "⚠️ Ошибка конфигурации: ADMIN_CHAT_ID_BACKUP имеет неверный формат."
-        )
-        return
-
-    if user_id != admin_id:
+    if user_id != _ADMIN_ID:
         await _send_reply(
             update,
             "🚫 У вас нет доступа к этой команде."
@@ -113,53 +125,65 @@ def _resolve_user_log_path() -> Path:
 
 
 async def _parse_log_file() -> Dict:
+    """Return weekly statistics, parsing bot_user.log in a worker thread.
+
+    A result parsed less than _LOG_CACHE_TTL_SEC ago is reused as long as the
+    log file has not been modified since.
+    """
+    global _LOG_CACHE
+
+    log_file_path = _resolve_user_log_path()
+    mtime = os.path.getmtime(log_file_path)
+    now = time.monotonic()
+    if _LOG_CACHE is not None:
+        cached_at, cached_path, cached_mtime, cached_stats = _LOG_CACHE
+        if now - cached_at < _LOG_CACHE_TTL_SEC and cached_path == log_file_path and cached_mtime == mtime:
+            return cached_stats
+
+    stats = await asyncio.to_thread(_parse_log_file_sync, log_file_path)
+    _LOG_CACHE = (now, log_file_path, mtime, stats)
+    return stats
+
+
+def _parse_log_file_sync(log_file_path: Path) -> Dict:
     """Parse bot_user.log and extract statistics for the last 7 days.
 
     Returns:
         Dict with keys:
             - unique_users: Set of user IDs
-            - actions: Dict mapping action name to count
+            - actions: Dict mapping action name to [count, bucket]
             - date_range: Tuple of (start_date, end_date)
     """
-    log_file_path = _resolve_user_log_path()
 
     # Calculate date range (last 7 days)
     now = datetime.now()
     week_ago = now - timedelta(days=7)
+    # Log timestamps are zero-padded "YYYY-MM-DD HH:MM:SS", so they order as plain strings
+    week_ago_str = week_ago.strftime('%Y-%m-%d %H:%M:%S')
 
     unique_users: Set[int] = set()
-    actions: Dict[str, int] = defaultdict(int)
-
-    with open(log_file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            try:
-                # Parse log line format: "YYYY-MM-DD HH:MM:SS,mmm - User_ID (@username) action"
-                if ' - User_' not in line:
-                    continue
-
-                # Extract timestamp
-                timestamp_str = line.split(',')[0]
-                timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+    actions: Dict[str, List] = {}
 
-                # Skip if outside date range
-                if timestamp < week_ago:
-                    continue
+    for line in _iter_recent_lines(log_file_path, week_ago):
+        match = _LOG_RE.match(line)
+        if not match:
+            # Skip lines that are not user actions
+            continue
+        timestamp_str, user_part, action_part = match.groups()
 
-                # Extract user ID
-                user_part = line.split('User_')[1].split(' ')[0]
-                user_id = int(user_part)
-                unique_users.add(user_id)
+        # Skip if outside date range
+        if timestamp_str < week_ago_str:
+            continue
 
-                # Extract action (everything after "@username) ")
-                action_part = line.split(') ', 1)[1].strip()
+        unique_users.add(int(user_part))
 
-                # Normalize action text
-                action = _normalize_action(action_part)
-                actions[action] += 1
-
-            except (ValueError, IndexError):
-                # Skip malformed lines
-                continue
+        # Normalize action text
+        action, bucket = _normalize_action(action_part.strip())
+        entry = actions.get(action)
+        if entry is None:
+            actions[action] = [1, bucket]
+        else:
+            entry[0] += 1
 
     return {
         'unique_users': unique_users,
@@ -168,6 +192,53 @@ async def _parse_log_file() -> Dict:
     }
 
 
+def _first_timestamp(block: bytes, partial_first_line: bool) -> Optional[datetime]:
+    """Return the timestamp of the first complete, parseable line in a block of the log."""
+    lines = block.split(b'\n')
+    if partial_first_line:
+        # The block starts mid-line; skip that fragment
+        lines = lines[1:]
+    for raw_line in lines:
+        try:
+            return datetime.strptime(raw_line[:19].decode('utf-8'), '%Y-%m-%d %H:%M:%S')
+        except (UnicodeDecodeError, ValueError):
+            continue
+    return None
+
+
+def _find_window_start(f, cutoff: datetime) -> int:
+    """Return a byte offset in the log at or before the first line newer than cutoff.
+
+    The log is append-only, so lines are in time order: blocks are read backwards
+    from the end until one starts with a line older than cutoff.
+    """
+    f.seek(0, os.SEEK_END)
+    offset = f.tell()
+    while offset > 0:
+        offset = max(0, offset - _LOG_SEEK_BLOCK_SIZE)
+        f.seek(offset, os.SEEK_SET)
+        block = f.read(_LOG_SEEK_BLOCK_SIZE)
+        first_timestamp = _first_timestamp(block, partial_first_line=offset > 0)
+        if first_timestamp is not None and first_timestamp < cutoff:
+            return offset
+    return 0
+
+
+def _iter_recent_lines(log_file_path: Path, cutoff: datetime) -> Iterator[str]:
+    """Yield log lines from roughly cutoff onwards without reading older history.
+
+    Lines just before the cutoff may be included; callers still filter by timestamp.
+    """
+    with open(log_file_path, 'rb') as f:
+        offset = _find_window_start(f, cutoff)
+        f.seek(offset, os.SEEK_SET)
+        if offset > 0:
+            # Drop the partial line the offset landed in
+            f.readline()
+        for raw_line in f:
+            yield raw_line.decode('utf-8')
+
+
 async def _gather_queue_metrics() -> Optional[Dict[str, Any]]:
     """Fetch rate limiter queue metrics if available."""
     if not messenger_service.is_configured():
@@ -180,6 +251,11 @@ async def _gather_queue_metrics() -> Optional[Dict[str, Any]]:
 
 
 async def _gather_system_metrics() -> Optional[Dict[str, Any]]:
+    """Collect system metrics in a worker thread (CPU sampling blocks for 0.1s)."""
+    return await asyncio.to_thread(_collect_system_metrics)
+
+
+def _collect_system_metrics() -> Optional[Dict[str, Any]]:
     """Collect current system resource metrics for the host running the bot."""
     try:
         import psutil  # type: ignore
@@ -225,7 +301,46 @@ async def _gather_system_metrics() -> Optional[Dict[str, Any]]:
     }
 
 
-def _normalize_action(action_text: str) -> str:
+# Prefixes of the actions that change user settings ("Other actions" in /log output)
+_OTHER_ACTION_PREFIXES = ('added', 'removed', 'created', 'deleted', 'renamed', 'switched', 'set ', 'exported', 'imported', 'entered')
+
+
+def _action_bucket(action: str) -> str:
+    """Return the /log output section ('command', 'button' or 'other') for a normalized action."""
+    if action.startswith('/'):
+        return 'command'
+    if action.startswith(_OTHER_ACTION_PREFIXES):
+        return 'other'
+    return 'button'
+
+
+# (prefix, normalized action, bucket), checked in order
+_ACTION_PREFIX_RULES = tuple(
+    (prefix, normalized, _action_bucket(normalized))
+    for prefix, normalized in (
+        ('added channel ', 'added channel'),
+        ('removed channel ', 'removed channel'),
+        ('switching to folder ', 'switched folder'),
+        ('set time to ', 'set time'),
+        ('set max posts to ', 'set max posts'),
+        ('created folder ', 'created folder'),
+        ('deleted folder ', 'deleted folder'),
+        ('renamed folder ', 'renamed folder'),
+    )
+)
+
+# (substring, normalized action, bucket), checked after the prefix rules
+_ACTION_SUBSTRING_RULES = tuple(
+    (substring, normalized, _action_bucket(normalized))
+    for substring, normalized in (
+        ('specified /time', '/time (specified)'),
+        ('exported backup', 'exported backup'),
+        ('imported backup', 'imported backup'),
+    )
+)
+
+
+def _normalize_action(action_text: str) -> Tuple[str, str]:
     """Normalize action text for grouping similar actions.
 
     Examples:
@@ -238,7 +353,7 @@ def _normalize_action(action_text: str) -> str:
         action_text: Raw action text from log
 
     Returns:
-        Normalized action name
+        Tuple of (normalized action name, bucket for _format_statistics)
     """
     action = action_text
 
@@ -256,30 +371,14 @@ def _normalize_action(action_text: str) -> str:
         action = action.split("'")[1]
 
     # Normalize complex actions to categories
-    if action.startswith('added channel '):
-        action = 'added channel'
-    elif action.startswith('removed channel '):
-        action = 'removed channel'
-    elif action.startswith('switching to folder '):
-        action = 'switched folder'
-    elif action.startswith('set time to '):
-        action = 'set time'
-    elif action.startswith('set max posts to '):
-        action = 'set max posts'
-    elif action.startswith('created folder '):
-        action = 'created folder'
-    elif action.startswith('deleted folder '):
-        action = 'deleted folder'
-    elif action.startswith('renamed folder '):
-        action = 'renamed folder'
-    elif 'specified /time' in action:
-        action = '/time (specified)'
-    elif 'exported backup' in action:
-        action = 'exported backup'
-    elif 'imported backup' in action:
-        action = 'imported backup'
-
-    return action
+    for prefix, normalized, bucket in _ACTION_PREFIX_RULES:
+        if action.startswith(prefix):
+            return normalized, bucket
+    for substring, normalized, bucket in _ACTION_SUBSTRING_RULES:
+        if substring in action:
+            return normalized, bucket
+
+    return action, _action_bucket(action)
 
 
 def _format_statistics(
@@ -292,7 +391,7 @@ def _format_statistics(
     actions = stats["actions"]
     start_date, end_date = stats["date_range"]
 
-    sorted_actions = sorted(actions.items(), key=lambda item: item[1], reverse=True)
+    sorted_actions = sorted(actions.items(), key=lambda item: item[1][0], reverse=True)
 
     message_lines: List[str] = [
         "<b>Weekly Usage Summary</b>",
@@ -318,14 +417,10 @@ def _format_statistics(
         commands = []
         buttons = []
         other_actions = []
+        sections = {'command': commands, 'button': buttons, 'other': other_actions}
 
-        for action, count in sorted_actions:
-            if action.startswith('/'):
-                commands.append((action, count))
-            elif action.startswith(('added', 'removed', 'created', 'deleted', 'renamed', 'switched', 'set ', 'exported', 'imported', 'entered')):
-                other_actions.append((action, count))
-            else:
-                buttons.append((action, count))
+        for action, (count, bucket) in sorted_actions:
+            sections[bucket].append((action, count))
 
         if commands:
             message_lines.append("")
@@ -345,7 +440,7 @@ def _format_statistics(
             for action, count in other_actions:
                 message_lines.append(f"- {action}: {count}")
 
-    total_actions = sum(actions.values())
+    total_actions = sum(count for count, _ in actions.values())
     message_lines.append("")
     message_lines.append(f"<b>Total actions:</b> {total_actions}")
 
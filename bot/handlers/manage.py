@@ -1,13 +1,21 @@
 # -*- coding: utf-8 -*-
 """Channel and folder management handlers."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Set, Tuple
+
+from telegram import Update, InlineKeyboardButton
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.utils.config import MAX_CHANNELS, MAX_NEWS_TIME_LIMIT_HOURS, MAX_SUMMARY_POSTS_LIMIT
 from bot.utils.logger import setup_logging
+from bot.utils.markup import CachedInlineKeyboardMarkup
+from bot.utils.users import get_user_identity
 from bot.utils.validators import validate_channel_name
-from bot.services import StorageService, ScraperService
+from bot.handlers.start import create_main_menu
+from bot.handlers.shared import get_storage, get_scraper
 from bot.services import messenger as messenger_service
 
 # Setup logging
@@ -41,69 +49,64 @@ async def _reply_text(
     return await messenger_service.send_text(chat.id, text, **send_kwargs)
 
 
+# Static keyboards are built once at import time and shared by every handler call.
+_ADD_ANOTHER_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Добавить еще канал", callback_data='add_channel')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_REMOVE_ANOTHER_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("➖ Удалить еще канал", callback_data='remove_channel')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_RETURN_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_TIME_INTERVAL_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("⏰ Изменить диапазон", callback_data='time_interval')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+_NEWS_COUNT_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Изменить количество", callback_data='news_count')],
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+
 def create_add_another_menu():
-    """Create keyboard for adding another channel or returning to menu."""
-    keyboard = [
-        [InlineKeyboardButton("➕ Добавить еще канал", callback_data='add_channel')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard for adding another channel or returning to menu."""
+    return _ADD_ANOTHER_MENU
 
 
 def create_remove_another_menu():
-    """Create keyboard for removing another channel or returning to menu."""
-    keyboard = [
-        [InlineKeyboardButton("➖ Удалить еще канал", callback_data='remove_channel')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard for removing another channel or returning to menu."""
+    return _REMOVE_ANOTHER_MENU
 
 
 def create_return_menu_button():
-    """Create keyboard with only return to menu button."""
-    keyboard = [
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard with only return to menu button."""
+    return _RETURN_MENU
 
 
 def create_time_interval_menu():
-    """Create keyboard for changing time interval or returning to menu."""
-    keyboard = [
-        [InlineKeyboardButton("⏰ Изменить диапазон", callback_data='time_interval')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return keyboard for changing time interval or returning to menu."""
+    return _TIME_INTERVAL_MENU
 
 
 def create_news_count_menu():
-    """Create keyboard for changing news count or returning to menu."""
-    keyboard = [
-        [InlineKeyboardButton("📊 Изменить количество", callback_data='news_count')],
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
-
+    """Return keyboard for changing news count or returning to menu."""
+    return _NEWS_COUNT_MENU
 
-async def create_folder_management_menu(user_id):
-    """Create folder management menu with all folders."""
-    storage = StorageService()
-    # Load user data once instead of calling get_user_folders and get_active_folder_name separately
-    data = await storage.load_user_data()
-    user_id_str = str(user_id)
-
-    # Get folders and active folder from loaded data
-    if user_id_str in data:
-        folders = data[user_id_str].get('folders', {'Папка1': []})
-        active_folder = data[user_id_str].get('active_folder', 'Папка1')
-    else:
-        folders = {'Папка1': []}
-        active_folder = 'Папка1'
 
+@lru_cache(maxsize=1024)
+def build_folder_management_menu(folder_names: Tuple[str, ...], active_folder: str):
+    """Build (and memoize) the folder management keyboard for a folder layout."""
     keyboard = []
 
     # Add switch folder buttons
-    for folder_name in folders.keys():
+    for folder_name in folder_names:
         active_marker = "✅ " if folder_name == active_folder else ""
         button_text = f"{active_marker}{folder_name}"
         keyboard.append([InlineKeyboardButton(button_text, callback_data=f'switch_folder:{folder_name}')])
@@ -113,9 +116,45 @@ async def create_folder_management_menu(user_id):
     keyboard.append([InlineKeyboardButton("🗑️ Удалить папку", callback_data='delete_folder')])
     keyboard.append([InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')])
 
-    return InlineKeyboardMarkup(keyboard)
+    return CachedInlineKeyboardMarkup(keyboard)
+
+
+async def get_user_view(user_id) -> Tuple[Tuple[str, ...], str]:
+    """
+    Return the user's folder names and active folder from a single data load.
+
+    The folder names come back as a tuple so the result can be passed straight
+    to the memoized menu builder.
+    """
+    storage = get_storage()
+    data = await storage.load_user_data()
+    user_data = data.get(str(user_id))
+
+    if user_data is None:
+        return ('Папка1',), 'Папка1'
+
+    folders = user_data.get('folders', {'Папка1': []})
+    return tuple(folders), user_data.get('active_folder', 'Папка1')
+
+
+async def create_folder_management_menu(user_id):
+    """Create folder management menu with all folders."""
+    folder_names, active_folder = await get_user_view(user_id)
+    return build_folder_management_menu(folder_names, active_folder)
+
+
+# Shown whenever the user has no channels in any folder
+_EMPTY_CHANNELS_MESSAGE = (
+    "📭 У вас нет добавленных каналов.\n"
+    "Используйте кнопку '➕ Добавить канал' для добавления."
+)
+
+# Russian plural forms for 1-4 units; every larger count uses the genitive plural
+_DAY_FORMS = {1: "день", 2: "дня", 3: "дня", 4: "дня"}
+_HOUR_FORMS = {1: "час", 2: "часа", 3: "часа", 4: "часа"}
 
 
+@lru_cache(maxsize=128)
 def format_time_display(hours: int) -> str:
     """
     Format time duration in Russian with proper pluralization.
@@ -128,19 +167,20 @@ def format_time_display(hours: int) -> str:
     """
     if hours >= 24 and hours % 24 == 0:
         days = hours // 24
-        if days == 1:
-            return f"{days} день"
-        elif days < 5:
-            return f"{days} дня"
-        else:
-            return f"{days} дней"
-    else:
-        if hours == 1:
-            return f"{hours} час"
-        elif hours < 5:
-            return f"{hours} часа"
-        else:
-            return f"{hours} часов"
+        return f"{days} {_DAY_FORMS.get(days, 'дней')}"
+    return f"{hours} {_HOUR_FORMS.get(hours, 'часов')}"
+
+
+async def _send_or_edit(update: Update, text: str, reply_markup, message_obj=None, processing_msg=None):
+    """Edit the processing message if there is one, otherwise send a new reply."""
+    if processing_msg:
+        try:
+            return await processing_msg.edit_text(text, reply_markup=reply_markup)
+        except BadRequest as exc:
+            if "not modified" in str(exc).lower():
+                return processing_msg
+            logger.debug("Could not edit message %s, sending a new one: %s", processing_msg.message_id, exc)
+    return await _reply_text(update, text, reply_markup=reply_markup, message_obj=message_obj)
 
 
 async def send_channel_list(update: Update, user_id: int, reply_markup=None, message_obj=None, processing_msg=None):
@@ -154,109 +194,75 @@ async def send_channel_list(update: Update, user_id: int, reply_markup=None, mes
         message_obj: Optional message object (for query.message)
         processing_msg: Optional processing message to delete after sending
     """
-    storage = StorageService()
+    storage = get_storage()
     data = await storage.load_user_data()
-    user_id_str = str(user_id)
-    msg = message_obj
-
-    if user_id_str not in data:
-        if processing_msg:
-            await processing_msg.edit_text(
-                "📭 У вас нет добавленных каналов.\n"
-                "Используйте кнопку '➕ Добавить канал' для добавления.",
-                reply_markup=reply_markup or create_return_menu_button()
-            )
-        else:
-            await _reply_text(
-                update,
-                "📭 У вас нет добавленных каналов.\n"
-                "Используйте кнопку '➕ Добавить канал' для добавления.",
-                reply_markup=reply_markup or create_return_menu_button(),
-                message_obj=msg,
-            )
-        return
+    user_data = data.get(str(user_id))
+    reply_markup = reply_markup or _RETURN_MENU
 
-    user_data = data[user_id_str]
+    if user_data is None:
+        await _send_or_edit(update, _EMPTY_CHANNELS_MESSAGE, reply_markup, message_obj, processing_msg)
+        return
 
     # Check if user has folders
     if 'folders' in user_data:
         folders = user_data['folders']
         active_folder = user_data.get('active_folder', 'Папка1')
-        all_channels = await storage.get_all_user_channels(user_id)
-
-        if not all_channels:
-            if processing_msg:
-                await processing_msg.edit_text(
-                    "📭 У вас нет добавленных каналов.\n"
-                    "Используйте кнопку '➕ Добавить канал' для добавления.",
-                    reply_markup=reply_markup or create_return_menu_button()
-                )
-            else:
-                await _reply_text(
-                    update,
-                    "📭 У вас нет добавленных каналов.\n"
-                    "Используйте кнопку '➕ Добавить канал' для добавления.",
-                    reply_markup=reply_markup or create_return_menu_button(),
-                    message_obj=msg,
-                )
+        # Count channels from the folders already loaded instead of reloading via storage
+        channel_count = sum(len(channels) for channels in folders.values())
+
+        if not channel_count:
+            await _send_or_edit(update, _EMPTY_CHANNELS_MESSAGE, reply_markup, message_obj, processing_msg)
             return
 
         # Build message with folders
-        message_parts = [f"📋 Ваши каналы ({len(all_channels)}/{MAX_CHANNELS}):\n"]
+        message_parts = [f"📋 Ваши каналы ({channel_count}/{MAX_CHANNELS}):\n"]
 
         for folder_name, channels in folders.items():
-            if channels:
-                active_marker = "✅ " if folder_name == active_folder else ""
-                message_parts.append(f"\n📁 {active_marker}{folder_name}:")
-                for i, ch in enumerate(channels, 1):
-                    message_parts.append(f"  {i}. {ch}")
+            if not channels:
+                continue
+            active_marker = "✅ " if folder_name == active_folder else ""
+            message_parts.append(f"\n📁 {active_marker}{folder_name}:")
+            message_parts.extend("  %d. %s" % (i, ch) for i, ch in enumerate(channels, 1))
 
         message = "\n".join(message_parts)
-        if processing_msg:
-            await processing_msg.edit_text(
-                message,
-                reply_markup=reply_markup or create_return_menu_button()
-            )
-        else:
-            await _reply_text(
-                update,
-                message,
-                reply_markup=reply_markup or create_return_menu_button(),
-                message_obj=msg,
-            )
     else:
         # Fallback for old structure
         channels = user_data.get('channels', [])
         if not channels:
-            if processing_msg:
-                await processing_msg.edit_text(
-                    "📭 У вас нет добавленных каналов.\n"
-                    "Используйте кнопку '➕ Добавить канал' для добавления.",
-                    reply_markup=reply_markup or create_return_menu_button()
-                )
-            else:
-                await _reply_text(
-                    update,
-                    "📭 У вас нет добавленных каналов.\n"
-                    "Используйте кнопку '➕ Добавить канал' для добавления.",
-                    reply_markup=reply_markup or create_return_menu_button(),
-                    message_obj=msg,
-                )
-        else:
-            channel_list = "\n".join([f"{i+1}. {ch}" for i, ch in enumerate(channels)])
-            message = f"📋 Ваши каналы ({len(channels)}/{MAX_CHANNELS}):\n\n{channel_list}"
-            if processing_msg:
-                await processing_msg.edit_text(
-                    message,
-                    reply_markup=reply_markup or create_return_menu_button()
-                )
-            else:
-                await _reply_text(
-                    update,
-                    message,
-                    reply_markup=reply_markup or create_return_menu_button(),
-                    message_obj=msg,
-                )
+            await _send_or_edit(update, _EMPTY_CHANNELS_MESSAGE, reply_markup, message_obj, processing_msg)
+            return
+
+        channel_list = "\n".join("%d. %s" % (i, ch) for i, ch in enumerate(channels, 1))
+        message = f"📋 Ваши каналы ({len(channels)}/{MAX_CHANNELS}):\n\n{channel_list}"
+
+    await _send_or_edit(update, message, reply_markup, message_obj, processing_msg)
+
+
+async def _load_channel_lists(storage, user_id) -> Tuple[List[str], Set[str]]:
+    """
+    Return the active folder channels and the set of all channels across folders.
+
+    Both come from a single load_user_data() call. The active folder list is a
+    copy so callers can append to it before saving; the set gives O(1)
+    duplicate checks (channels are unique across folders, so its size is the
+    channel count).
+    """
+    data = await storage.load_user_data()
+    user_data = data.get(str(user_id))
+
+    if user_data is None:
+        return [], set()
+
+    if 'folders' not in user_data:
+        # Fallback for old structure
+        channels = list(user_data.get('channels', []))
+        return channels, set(channels)
+
+    folders = user_data['folders']
+    active_folder = user_data.get('active_folder', 'Папка1')
+    channels = list(folders.get(active_folder, []))
+    all_channels = {channel for folder_channels in folders.values() for channel in folder_channels}
+    return channels, all_channels
 
 
 # ============================================================================
@@ -265,15 +271,14 @@ async def send_channel_list(update: Update, user_id: int, reply_markup=None, mes
 
 async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /add command."""
-    storage = StorageService()
-    scraper = ScraperService()
+    storage = get_storage()
+    scraper = get_scraper()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     # Check if channel name is provided
     if not context.args:
-        user_logger.info(f"User_{user_id} (@{username}) clicked /add (no channel specified)")
+        user_logger.info("User_%s (@%s) clicked /add (no channel specified)", user_id, username)
         await _reply_text(update, "❌ Укажите название канала. Например: /add @channelname или /add https://t.me/channelname")
         return
 
@@ -285,10 +290,8 @@ async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         await _reply_text(update, f"Неверный идентификатор канала: {exc}")
         return
 
-    # Get current user channels (from active folder)
-    channels = await storage.get_user_channels(user_id)
-    # Get all channels across all folders
-    all_channels = await storage.get_all_user_channels(user_id)
+    # Get active folder channels and all channels across folders from one load
+    channels, all_channels = await _load_channel_lists(storage, user_id)
 
     # Check if channel already exists in ANY folder (no duplicates allowed)
     if channel in all_channels:
@@ -304,28 +307,27 @@ async def add_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     is_valid, error_msg = await scraper.validate_channel_access(channel, update)
 
     if not is_valid:
-        logger.warning(f"User {user_id} tried to add inaccessible channel {channel}: {error_msg}")
+        logger.warning("User %s tried to add inaccessible channel %s: %s", user_id, channel, error_msg)
         return
 
     # Add channel
     channels.append(channel)
     await storage.set_user_channels(user_id, channels)
 
-    logger.info(f"User {user_id} added channel {channel}.")
-    user_logger.info(f"User_{user_id} (@{username}) specified /add {channel}")
+    logger.info("User %s added channel %s.", user_id, channel)
+    user_logger.info("User_%s (@%s) specified /add %s", user_id, username, channel)
     await _reply_text(update, f"✅ {channel} был добавлен.")
 
 
 async def remove_channel_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /remove command."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     # Check if channel name is provided
     if not context.args:
-        user_logger.info(f"User_{user_id} (@{username}) clicked /remove (no channel specified)")
+        user_logger.info("User_%s (@%s) clicked /remove (no channel specified)", user_id, username)
         await _reply_text(update, "❌ Укажите название канала. Например: /remove @channelname или /remove https://t.me/channelname")
         return
 
@@ -349,17 +351,16 @@ async def remove_channel_command(update: Update, context: ContextTypes.DEFAULT_T
     channels.remove(channel)
     await storage.set_user_channels(user_id, channels)
 
-    user_logger.info(f"User_{user_id} (@{username}) specified /remove {channel}")
+    user_logger.info("User_%s (@%s) specified /remove %s", user_id, username, channel)
     await _reply_text(update, f"🗑️ {channel} был удален.")
 
 
 async def remove_all_channels_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /remove_all command."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    user_logger.info(f"User_{user_id} (@{username}) clicked /remove_all")
+    user_id, username = get_user_identity(update)
+    user_logger.info("User_%s (@%s) clicked /remove_all", user_id, username)
 
     # Get current user channels
     channels = await storage.get_user_channels(user_id)
@@ -377,23 +378,21 @@ async def remove_all_channels_command(update: Update, context: ContextTypes.DEFA
 
 async def list_channels_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /list command - show all folders and channels."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    user_logger.info(f"User_{user_id} (@{username}) clicked /list")
+    user_id, username = get_user_identity(update)
+    user_logger.info("User_%s (@%s) clicked /list", user_id, username)
 
     await send_channel_list(update, user_id)
 
 
 async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /time command - set news time range."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     # Check if hours value is provided
     if not context.args:
-        user_logger.info(f"User_{user_id} (@{username}) clicked /time (view current)")
+        user_logger.info("User_%s (@%s) clicked /time (view current)", user_id, username)
         current_time = await storage.get_user_time_limit(user_id)
 
         # Format display: hours or days
@@ -440,8 +439,8 @@ async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Set the new time limit
         await storage.set_user_time_limit(user_id, hours)
-        logger.info(f"User {user_id} set time limit to {hours} hours ({input_type}: {input_display}).")
-        user_logger.info(f"User_{user_id} (@{username}) specified /time {context.args[0]}")
+        logger.info("User %s set time limit to %s hours (%s: %s).", user_id, hours, input_type, input_display)
+        user_logger.info("User_%s (@%s) specified /time %s", user_id, username, context.args[0])
 
         # Format success message
         if hours >= 24 and hours % 24 == 0:
@@ -468,14 +467,13 @@ async def time_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def posts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /posts command - set maximum number of news summaries."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     # Check if posts value is provided
     if not context.args:
-        user_logger.info(f"User_{user_id} (@{username}) clicked /posts (view current)")
+        user_logger.info("User_%s (@%s) clicked /posts (view current)", user_id, username)
         current_max = await storage.get_user_max_posts(user_id)
         await _reply_text(
 
@@ -505,8 +503,8 @@ async def posts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # Set the new max posts
         await storage.set_user_max_posts(user_id, max_posts)
-        logger.info(f"User {user_id} set max posts to {max_posts}.")
-        user_logger.info(f"User_{user_id} (@{username}) specified /posts {max_posts}")
+        logger.info("User %s set max posts to %s.", user_id, max_posts)
+        user_logger.info("User_%s (@%s) specified /posts %s", user_id, username, max_posts)
 
         await _reply_text(
 
@@ -520,12 +518,18 @@ async def posts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await _reply_text(update, "❌ Укажите корректное число. Например: /posts 10")
 
 
+@lru_cache(maxsize=256)
+def _format_backup_timestamp(mtime: float) -> str:
+    """Format a backup file mtime as a UTC timestamp (backups rarely change between calls)."""
+    return datetime.utcfromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+
+
 async def restore_backup_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /restore_backup admin command."""
     from bot.utils.config import ADMIN_CHAT_ID_BACKUP_INT
-    from datetime import datetime
+    from bot.handlers.start import reset_initialized_users
 
-    storage = StorageService()
+    storage = get_storage()
 
     user = update.effective_user
     admin_id = ADMIN_CHAT_ID_BACKUP_INT
@@ -545,13 +549,15 @@ async def restore_backup_command(update: Update, context: ContextTypes.DEFAULT_T
         return
 
     if not context.args:
-        lines = ['Available backups:']
-        for idx, backup in enumerate(backups, 1):
-            timestamp = datetime.utcfromtimestamp(backup['mtime']).strftime('%Y-%m-%d %H:%M:%S')
-            lines.append(f"{idx}. {backup['name']} (UTC {timestamp})")
-        lines.append('')
-        lines.append('Run `/restore_backup <number>` or `/restore_backup latest` to restore.')
-        await _reply_text(update, "\n".join(lines))
+        listing = "\n".join(
+            f"{idx}. {backup['name']} (UTC {_format_backup_timestamp(backup['mtime'])})"
+            for idx, backup in enumerate(backups, 1)
+        )
+        await _reply_text(
+            update,
+            f"Available backups:\n{listing}\n\n"
+            "Run `/restore_backup <number>` or `/restore_backup latest` to restore."
+        )
         return
 
     choice = context.args[0].strip().lower()
@@ -580,9 +586,12 @@ async def restore_backup_command(update: Update, context: ContextTypes.DEFAULT_T
         await _reply_text(update, 'Unexpected error occurred during restore.')
         return
 
-    user_logger.info(f"Admin_{user.id} restored backup {selected['name']}")
+    # The restored data may lack users that /start has already initialized
+    reset_initialized_users()
+
+    user_logger.info("Admin_%s restored backup %s", user.id, selected['name'])
     logger.info('Admin %s restored backup %s', user.id, selected['path'])
-    timestamp = datetime.utcfromtimestamp(selected['mtime']).strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = _format_backup_timestamp(selected['mtime'])
     await _reply_text(
 
         update,
@@ -596,11 +605,10 @@ async def restore_backup_command(update: Update, context: ContextTypes.DEFAULT_T
 
 async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle user input for adding a channel."""
-    storage = StorageService()
-    scraper = ScraperService()
+    storage = get_storage()
+    scraper = get_scraper()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
     raw_channel = (update.message.text or "").strip()
 
     try:
@@ -609,14 +617,12 @@ async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT
         await _reply_text(update, f"Неверный идентификатор канала: {exc}")
         return WAITING_FOR_CHANNEL_ADD
 
-    # Get current user channels (from active folder)
-    channels = await storage.get_user_channels(user_id)
-    # Get all channels across all folders
-    all_channels = await storage.get_all_user_channels(user_id)
+    # Get active folder channels and all channels across folders from one load
+    channels, all_channels = await _load_channel_lists(storage, user_id)
 
     # Check if channel already exists in ANY folder (no duplicates allowed)
     if channel in all_channels:
-        reply_markup = create_add_another_menu()
+        reply_markup = _ADD_ANOTHER_MENU
         await _reply_text(
 
             update,
@@ -627,7 +633,6 @@ async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT
 
     # Check channel limit (global across all folders)
     if len(all_channels) >= MAX_CHANNELS:
-        from bot.handlers.start import create_main_menu
         reply_markup = create_main_menu()
         await _reply_text(
 
@@ -640,10 +645,10 @@ async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT
     # Validate channel accessibility
     is_valid, error_msg = await scraper.validate_channel_access(channel, update)
 
-    reply_markup = create_add_another_menu()
+    reply_markup = _ADD_ANOTHER_MENU
 
     if not is_valid:
-        logger.warning(f"User {user_id} tried to add inaccessible channel {channel}: {error_msg}")
+        logger.warning("User %s tried to add inaccessible channel %s: %s", user_id, channel, error_msg)
         await _reply_text(
 
             update,
@@ -656,8 +661,8 @@ async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT
     channels.append(channel)
     await storage.set_user_channels(user_id, channels)
 
-    logger.info(f"User {user_id} added channel {channel}.")
-    user_logger.info(f"User_{user_id} (@{username}) added channel {channel} via button")
+    logger.info("User %s added channel %s.", user_id, channel)
+    user_logger.info("User_%s (@%s) added channel %s via button", user_id, username, channel)
 
     await _reply_text(
 
@@ -672,10 +677,9 @@ async def handle_add_channel_input(update: Update, context: ContextTypes.DEFAULT
 
 async def handle_remove_channel_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle user input for removing a channel."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
     raw_channel = (update.message.text or "").strip()
 
     try:
@@ -689,7 +693,7 @@ async def handle_remove_channel_input(update: Update, context: ContextTypes.DEFA
 
     # Check if channel exists in user's list
     if channel not in channels:
-        reply_markup = create_remove_another_menu()
+        reply_markup = _REMOVE_ANOTHER_MENU
         await _reply_text(
 
             update,
@@ -702,8 +706,8 @@ async def handle_remove_channel_input(update: Update, context: ContextTypes.DEFA
     channels.remove(channel)
     await storage.set_user_channels(user_id, channels)
 
-    user_logger.info(f"User_{user_id} (@{username}) removed channel {channel} via button")
-    reply_markup = create_remove_another_menu()
+    user_logger.info("User_%s (@%s) removed channel %s via button", user_id, username, channel)
+    reply_markup = _REMOVE_ANOTHER_MENU
     await _reply_text(
 
         update,
@@ -716,10 +720,7 @@ async def handle_remove_channel_input(update: Update, context: ContextTypes.DEFA
 
 async def handle_time_interval_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle user input for setting time interval."""
-    storage = StorageService()
-
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
     input_value = update.message.text.strip().lower()
 
     try:
@@ -731,34 +732,27 @@ async def handle_time_interval_input(update: Update, context: ContextTypes.DEFAU
         else:
             hours = int(input_value)
             input_type = "hours"
+    except ValueError:
+        hours = None
 
+    # Every outcome replies once with the time interval menu
+    if hours is None:
+        text = (
+            "❌ Укажите корректное значение.\n"
+            "Примеры: 24 или 7d"
+        )
+    elif hours < 1:
+        text = "❌ Временной диапазон должен быть больше 0."
+    elif hours > MAX_NEWS_TIME_LIMIT_HOURS:
+        text = f"❌ Временной диапазон не может превышать {MAX_NEWS_TIME_LIMIT_HOURS} часов (7 дней)."
+    else:
         input_display = format_time_display(hours)
 
-        # Validate hours
-        if hours < 1:
-            reply_markup = create_time_interval_menu()
-            await _reply_text(
-
-                update,
-                "❌ Временной диапазон должен быть больше 0.",
-                reply_markup=reply_markup
-            )
-            return ConversationHandler.END
-
-        if hours > MAX_NEWS_TIME_LIMIT_HOURS:
-            reply_markup = create_time_interval_menu()
-            await _reply_text(
-
-                update,
-                f"❌ Временной диапазон не может превышать {MAX_NEWS_TIME_LIMIT_HOURS} часов (7 дней).",
-                reply_markup=reply_markup
-            )
-            return ConversationHandler.END
-
         # Set the new time limit
+        storage = get_storage()
         await storage.set_user_time_limit(user_id, hours)
-        logger.info(f"User {user_id} set time limit to {hours} hours ({input_type}: {input_display}).")
-        user_logger.info(f"User_{user_id} (@{username}) set time to {input_value} via button")
+        logger.info("User %s set time limit to %s hours (%s: %s).", user_id, hours, input_type, input_display)
+        user_logger.info("User_%s (@%s) set time to %s via button", user_id, username, input_value)
 
         # Format success message
         if hours >= 24 and hours % 24 == 0:
@@ -766,91 +760,52 @@ async def handle_time_interval_input(update: Update, context: ContextTypes.DEFAU
         else:
             equivalent = input_display
 
-        reply_markup = create_time_interval_menu()
-        await _reply_text(
-
-            update,
+        text = (
             f"✅ Временной диапазон установлен: {equivalent}\n"
-            f"Команда 'Получить новости' будет собирать новости за последние {equivalent.split('(')[0].strip()}.",
-            reply_markup=reply_markup
-        )
-
-    except ValueError:
-        reply_markup = create_time_interval_menu()
-        await _reply_text(
-
-            update,
-            "❌ Укажите корректное значение.\n"
-            "Примеры: 24 или 7d",
-            reply_markup=reply_markup
+            f"Команда 'Получить новости' будет собирать новости за последние {equivalent.split('(')[0].strip()}."
         )
 
+    await _reply_text(update, text, reply_markup=_TIME_INTERVAL_MENU)
     return ConversationHandler.END
 
 
 async def handle_news_count_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle user input for setting news count."""
-    storage = StorageService()
-
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     try:
         max_posts = int(update.message.text.strip())
-
-        # Validate max_posts
-        if max_posts < 1:
-            reply_markup = create_news_count_menu()
-            await _reply_text(
-
-                update,
-                "❌ Количество новостей должно быть больше 0.",
-                reply_markup=reply_markup
-            )
-            return ConversationHandler.END
-
-        if max_posts > MAX_SUMMARY_POSTS_LIMIT:
-            reply_markup = create_news_count_menu()
-            await _reply_text(
-
-                update,
-                f"❌ Количество новостей не может превышать {MAX_SUMMARY_POSTS_LIMIT}.",
-                reply_markup=reply_markup
-            )
-            return ConversationHandler.END
-
+    except ValueError:
+        max_posts = None
+
+    # Every outcome replies once with the news count menu
+    if max_posts is None:
+        text = "❌ Укажите корректное число. Например: 10"
+    elif max_posts < 1:
+        text = "❌ Количество новостей должно быть больше 0."
+    elif max_posts > MAX_SUMMARY_POSTS_LIMIT:
+        text = f"❌ Количество новостей не может превышать {MAX_SUMMARY_POSTS_LIMIT}."
+    else:
         # Set the new max posts
+        storage = get_storage()
         await storage.set_user_max_posts(user_id, max_posts)
-        logger.info(f"User {user_id} set max posts to {max_posts}.")
-        user_logger.info(f"User_{user_id} (@{username}) set posts to {max_posts} via button")
-
-        reply_markup = create_news_count_menu()
-        await _reply_text(
+        logger.info("User %s set max posts to %s.", user_id, max_posts)
+        user_logger.info("User_%s (@%s) set posts to %s via button", user_id, username, max_posts)
 
-            update,
+        text = (
             f"✅ Количество новостей установлено: {max_posts}\n"
-            f"Команда 'Получить новости' будет показывать до {max_posts} новостей.",
-            reply_markup=reply_markup
-        )
-
-    except ValueError:
-        reply_markup = create_news_count_menu()
-        await _reply_text(
-
-            update,
-            "❌ Укажите корректное число. Например: 10",
-            reply_markup=reply_markup
+            f"Команда 'Получить новости' будет показывать до {max_posts} новостей."
         )
 
+    await _reply_text(update, text, reply_markup=_NEWS_COUNT_MENU)
     return ConversationHandler.END
 
 
 async def handle_new_folder_name(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle user input for creating a new folder."""
-    storage = StorageService()
+    storage = get_storage()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
 
     folder_name = update.message.text.strip()
 
@@ -865,8 +820,8 @@ async def handle_new_folder_name(update: Update, context: ContextTypes.DEFAULT_T
 
     # Create the folder
     if await storage.create_folder(user_id, folder_name):
-        logger.info(f"User {user_id} created folder '{folder_name}'.")
-        user_logger.info(f"User_{user_id} (@{username}) created folder '{folder_name}'")
+        logger.info("User %s created folder '%s'.", user_id, folder_name)
+        user_logger.info("User_%s (@%s) created folder '%s'", user_id, username, folder_name)
 
         reply_markup = await create_folder_management_menu(user_id)
         await _reply_text(
@@ -3,15 +3,24 @@
 
 import asyncio
 from datetime import datetime, timezone
-from telegram import Update
+from itertools import chain
+from typing import Set
+from telegram import Update, InlineKeyboardButton
 from telegram.ext import ContextTypes
 
-from bot.utils.config import MAX_NEWS_REQUESTS_PER_DAY, DEFAULT_NEWS_TIME_LIMIT_HOURS, DEFAULT_MAX_SUMMARY_POSTS
+from bot.utils.config import (
+    MAX_NEWS_REQUESTS_PER_DAY,
+    DEFAULT_NEWS_TIME_LIMIT_HOURS,
+    DEFAULT_MAX_SUMMARY_POSTS,
+    ENABLE_RATE_LIMITED_QUEUE,
+    SCRAPE_CONCURRENT_LIMIT,
+)
 from bot.utils.logger import setup_logging
+from bot.utils.markup import CachedInlineKeyboardMarkup
+from bot.utils.users import get_user_identity
+from bot.handlers.shared import get_storage, get_scraper
 from bot.services import (
-    StorageService,
     AIService,
-    ScraperService,
     ClusteringService,
     messenger as messenger_service,
 )
@@ -19,29 +28,132 @@ from bot.services import (
 # Setup logging
 logger, user_logger = setup_logging()
 
+# Shared by all /news requests so concurrent users cannot open unbounded t.me connections
+_SCRAPE_SEMAPHORE = asyncio.Semaphore(SCRAPE_CONCURRENT_LIMIT)
+
+# Users whose digest is currently being built
+_news_in_progress: Set[int] = set()
+_NEWS_IN_PROGRESS_MESSAGE = "⏳ Уже обрабатываю ваш предыдущий запрос..."
+
+# Characters that must be escaped in Telegram MarkdownV2 text
+_MARKDOWN_V2_SPECIAL_CHARS = '_*[]()~`>#+-=|{}.!'
+_MARKDOWN_V2_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in _MARKDOWN_V2_SPECIAL_CHARS})
+
+# Static keyboard sent after every digest
+_RETURN_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
+])
+
+# Digest entry layouts (MarkdownV2 and its plain-text fallback)
+_DIGEST_TEMPLATE = (
+    "{emoji} *{idx}\\. {headline}*\n\n"
+    "{summary}\n\n"
+    "_Источники \\({count}\\): {sources}_\n"
+)
+_DIGEST_PLAIN_TEMPLATE = (
+    "{emoji} {idx}. {headline}\n\n"
+    "{summary}\n\n"
+    "Источники ({count}): {sources}\n"
+)
+
+
+def escape_markdown(text: str) -> str:
+    """Escape special characters for Telegram MarkdownV2."""
+    return text.translate(_MARKDOWN_V2_ESCAPE_TABLE)
+
 
 def create_return_menu_button():
-    """Import to avoid circular dependency."""
-    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-    keyboard = [
-        [InlineKeyboardButton("🏠 Вернуться в меню", callback_data='return_to_menu')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return the shared 'return to menu' keyboard."""
+    return _RETURN_MENU
+
+
+def _format_channel_names(summary: dict) -> str:
+    """Return up to three source channel names, noting how many more there are."""
+    channels_text = ", ".join(summary['channels'][:3])
+    if len(summary['channels']) > 3:
+        channels_text += f" и еще {len(summary['channels']) - 3}"
+    return channels_text
+
+
+def _render_summary(idx: int, summary: dict) -> str:
+    """Render one digest entry as a MarkdownV2 message."""
+    coverage_emoji = "🔥" if summary['count'] > 3 else "📰"
+
+    # Escape special Markdown characters in dynamic content
+    headline_escaped = escape_markdown(summary['headline'])
+    summary_escaped = escape_markdown(summary['summary'])
+
+    # Create clickable links for sources
+    post_links = summary.get('post_links', [])
+    if post_links:
+        # Create markdown links: [channel](url)
+        links_text = []
+        for link in post_links[:]:  # [:5] Limit to first 5 links to avoid cluttering
+            channel_escaped = escape_markdown(link['channel'])
+            url_escaped = escape_markdown(link['url'])
+            links_text.append(f"[{channel_escaped}]({url_escaped})")
+
+        sources_line = ", ".join(links_text)
+        #if len(post_links) > 5:
+        #    sources_line += f" и еще {len(post_links) - 5}"
+    else:
+        # Fallback to channel names without links
+        sources_line = escape_markdown(_format_channel_names(summary))
+
+    return _DIGEST_TEMPLATE.format(
+        emoji=coverage_emoji,
+        idx=idx,
+        headline=headline_escaped,
+        summary=summary_escaped,
+        count=summary['count'],
+        sources=sources_line,
+    )
+
+
+def _render_summary_plain(idx: int, summary: dict) -> str:
+    """Render one digest entry as plain text (used when MarkdownV2 is rejected)."""
+    return _DIGEST_PLAIN_TEMPLATE.format(
+        emoji="🔥" if summary['count'] > 3 else "📰",
+        idx=idx,
+        headline=summary['headline'],
+        summary=summary['summary'],
+        count=summary['count'],
+        sources=_format_channel_names(summary),
+    )
 
 
 async def news_command_internal(update: Update, context: ContextTypes.DEFAULT_TYPE, processing_msg=None):
     """Internal news command handler that works with both command and button."""
-    storage = StorageService()
+    user_id, _ = get_user_identity(update)
+
+    # One digest per user at a time: a second request would repeat the scrape,
+    # the AI calls and race the daily counter update
+    if user_id in _news_in_progress:
+        if processing_msg:
+            await processing_msg.edit_text(_NEWS_IN_PROGRESS_MESSAGE)
+        else:
+            await messenger_service.send_text(update.effective_chat.id, _NEWS_IN_PROGRESS_MESSAGE)
+        return
+
+    _news_in_progress.add(user_id)
+    try:
+        await _build_and_send_digest(update, processing_msg)
+    finally:
+        _news_in_progress.discard(user_id)
+
+
+async def _build_and_send_digest(update: Update, processing_msg=None):
+    """Check limits, then scrape, cluster, summarize and send the user's digest."""
+    storage = get_storage()
     ai_service = AIService()
-    scraper = ScraperService()
+    scraper = get_scraper()
     clustering = ClusteringService()
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
+    user_id, username = get_user_identity(update)
     chat_id = update.effective_chat.id
 
-    logger.info(f"User {user_id} ran /news command.")
-    user_logger.info(f"User_{user_id} (@{username}) clicked /news")
+    logger.info("User %s ran /news command.", user_id)
+    user_logger.info("User_%s (@%s) clicked /news", user_id, username)
 
     # Load user data once to avoid multiple redundant loads
     data = await storage.load_user_data()
@@ -112,14 +224,19 @@ async def news_command_internal(update: Update, context: ContextTypes.DEFAULT_TY
         status_message = await messenger_service.send_text(chat_id, status_text)
 
     try:
-        # Step 1: Scrape all channels concurrently
-        scraping_tasks = [scraper.scrape_channel(channel, time_limit) for channel in channels]
-        channel_posts = await asyncio.gather(*scraping_tasks)
+        # Step 1: Scrape all channels concurrently (bounded bot-wide by the scrape semaphore)
+        async def scrape_bounded(channel):
+            async with _SCRAPE_SEMAPHORE:
+                return await scraper.scrape_channel(channel, time_limit)
+
+        channel_posts = await asyncio.gather(*(scrape_bounded(channel) for channel in channels))
 
-        # Flatten the list of posts
+        # Flatten the posts and collect the embedding inputs in the same pass
         all_posts = []
-        for posts in channel_posts:
-            all_posts.extend(posts)
+        texts = []
+        for post in chain.from_iterable(channel_posts):
+            all_posts.append(post)
+            texts.append(post['text'])
 
         if not all_posts:
             if len(channels) == 1:
@@ -137,18 +254,21 @@ async def news_command_internal(update: Update, context: ContextTypes.DEFAULT_TY
                 )
             return
 
-        await status_message.edit_text(
-            f"🔍 Найдено {len(all_posts)} поста(ов)\n"
-            f"📊 Анализирую и группирую похожие новости ..."
-        )
+        if len(all_posts) == 1:
+            # A single post is its own story; skip the embedding round-trip and clustering
+            clusters = [all_posts]
+        else:
+            await status_message.edit_text(
+                f"🔍 Найдено {len(all_posts)} поста(ов)\n"
+                f"📊 Анализирую и группирую похожие новости ..."
+            )
 
-        # Step 2: Cluster similar posts (async to avoid blocking)
-        texts = [post['text'] for post in all_posts]
-        embeddings = await ai_service.get_embeddings(texts)
-        clusters = clustering.cluster_posts(embeddings, all_posts)
+            # Step 2: Cluster similar posts (async to avoid blocking)
+            embeddings = await ai_service.get_embeddings(texts)
+            clusters = clustering.cluster_posts(embeddings, all_posts)
 
-        # Sort clusters by size (most covered stories first)
-        clusters.sort(key=len, reverse=True)
+            # Sort clusters by size (most covered stories first)
+            clusters.sort(key=len, reverse=True)
 
         # Show clustering results
         await status_message.edit_text(
@@ -170,7 +290,7 @@ async def news_command_internal(update: Update, context: ContextTypes.DEFAULT_TY
         # Filter out failed summaries (those without headlines)
         summaries = [s for s in all_summaries if s and s.get('headline')]
 
-        logger.info(f"/news command for user {user_id} found {len(clusters)} stories from {len(all_posts)} posts.")
+        logger.info("/news command for user %s found %s stories from %s posts.", user_id, len(clusters), len(all_posts))
 
         # Step 4: Format and send results
         if not summaries:
@@ -181,80 +301,35 @@ async def news_command_internal(update: Update, context: ContextTypes.DEFAULT_TY
 
         await status_message.delete()
 
-        # Send header
+        # Send header (local time of the request, reusing the rate-limit clock reading)
         header = (
             f"📰 Дайджест новостей\n"
-            f"🕐 {datetime.now().strftime('%d.%m.%Y %H:%M')}\n"
+            f"🕐 {now.astimezone().strftime('%d.%m.%Y %H:%M')}\n"
             f"🔥 {len(summaries)} уникальных новостей для Вас! Собраны из {len(channels)} каналов\n"
         )
 
         await messenger_service.send_text(chat_id, header)
 
-        # Send each summary
-        for idx, summary in enumerate(summaries, 1):
-            coverage_emoji = "🔥" if summary['count'] > 3 else "📰"
-
-            # Escape special Markdown characters in dynamic content
-            def escape_markdown(text):
-                """Escape special characters for Telegram MarkdownV2."""
-                special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-                for char in special_chars:
-                    text = text.replace(char, '\\' + char)
-                return text
-
-            headline_escaped = escape_markdown(summary['headline'])
-            summary_escaped = escape_markdown(summary['summary'])
-
-            # Create clickable links for sources
-            post_links = summary.get('post_links', [])
-            if post_links:
-                # Create markdown links: [channel](url)
-                links_text = []
-                for link in post_links[:]:  # [:5] Limit to first 5 links to avoid cluttering
-                    channel_escaped = escape_markdown(link['channel'])
-                    url_escaped = escape_markdown(link['url'])
-                    links_text.append(f"[{channel_escaped}]({url_escaped})")
-
-                sources_line = ", ".join(links_text)
-                #if len(post_links) > 5:
-                #    sources_line += f" и еще {len(post_links) - 5}"
-            else:
-                # Fallback to channel names without links
-                channels_text = ", ".join(summary['channels'][:3])
-                if len(summary['channels']) > 3:
-                    channels_text += f" и еще {len(summary['channels']) - 3}"
-                sources_line = escape_markdown(channels_text)
-
-            message = (
-                f"{coverage_emoji} *{idx}\\. {headline_escaped}*\n\n"
-                f"{summary_escaped}\n\n"
-                f"_Источники \\({summary['count']}\\): {sources_line}_\n"
-            )
+        # Render every message up front, then deliver them in order
+        messages = [_render_summary(idx, summary) for idx, summary in enumerate(summaries, 1)]
 
+        for idx, (summary, message) in enumerate(zip(summaries, messages), 1):
             try:
                 await messenger_service.send_text(chat_id, message, parse_mode='MarkdownV2')
             except Exception as e:
-                # Fallback to plain text if markdown parsing fails
-                channels_text = ", ".join(summary['channels'][:3])
-                if len(summary['channels']) > 3:
-                    channels_text += f" и еще {len(summary['channels']) - 3}"
-
-                message_plain = (
-                    f"{coverage_emoji} {idx}. {summary['headline']}\n\n"
-                    f"{summary['summary']}\n\n"
-                    f"Источники ({summary['count']}): {channels_text}\n"
-                )
-                await messenger_service.send_text(chat_id, message_plain)
+                # Fallback to plain text if markdown parsing fails (escaping should make this rare)
+                logger.warning("MarkdownV2 digest entry %s rejected for user %s, sending plain text: %s", idx, user_id, e)
+                await messenger_service.send_text(chat_id, _render_summary_plain(idx, summary))
 
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.5)
+            # The rate-limited queue already paces sends; only throttle when it is disabled
+            if not ENABLE_RATE_LIMITED_QUEUE:
+                await asyncio.sleep(0.5)
 
         # Send return to menu button without separator
-        reply_markup = create_return_menu_button()
-        await messenger_service.send_text(chat_id, "Выберите действие:", reply_markup=reply_markup)
+        await messenger_service.send_text(chat_id, "Выберите действие:", reply_markup=_RETURN_MENU)
 
     except Exception as e:
-        logger.error(f"Error in news_command for user {user_id}: {str(e)}", exc_info=True)
+        logger.error("Error in news_command for user %s: %s", user_id, e, exc_info=True)
         error_text = "😕 Извините, что-то пошло не так. Попробуйте позже."
         await messenger_service.send_text(chat_id, error_text)
 
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Service instances shared by the handler modules.
+
+Handlers used to construct a StorageService/ScraperService on every update.
+The instances below are created on first use and then reused, so any state
+the services keep (HTTP client, cached data) lives for the whole process.
+"""
+
+from functools import lru_cache
+
+from bot.services import StorageService, ScraperService
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageService:
+    """Return the process-wide StorageService."""
+    return StorageService()
+
+
+@lru_cache(maxsize=1)
+def get_scraper() -> ScraperService:
+    """Return the process-wide ScraperService (closed on bot shutdown)."""
+    return ScraperService()
@@ -1,17 +1,25 @@
 # -*- coding: utf-8 -*-
 """Start command handler."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
-from telegram.ext import ContextTypes
+from typing import Set
+
+from telegram import Update, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+from telegram.ext import ContextTypes, ConversationHandler
 
 from bot.utils.config import DEFAULT_NEWS_TIME_LIMIT_HOURS, DEFAULT_MAX_SUMMARY_POSTS
 from bot.utils.logger import setup_logging
-from bot.services import StorageService
+from bot.utils.markup import CachedInlineKeyboardMarkup
+from bot.utils.users import get_user_identity
+from bot.handlers.shared import get_storage
 from bot.services import messenger as messenger_service
 
 # Setup logging
 logger, user_logger = setup_logging()
 
+# Users whose record is known to exist; lets repeat /start skip the user-data load.
+# Assumes user_data.json is only changed by this process (reset after /restore_backup).
+_initialized_users: Set[int] = set()
+
 
 async def _send_reply(
     update: Update,
@@ -33,107 +41,125 @@ async def _send_reply(
     return await messenger_service.send_text(chat.id, text, **send_kwargs)
 
 
+# Static keyboards are built once at import time and shared by every handler call.
+_PERSISTENT_KEYBOARD = ReplyKeyboardMarkup(
+    [[KeyboardButton("🏠 Вернуться в меню")]],
+    resize_keyboard=True,
+    one_time_keyboard=False
+)
+
+_MAIN_MENU = CachedInlineKeyboardMarkup([
+    [InlineKeyboardButton("✨ Начать", callback_data='start_plans')],
+    [InlineKeyboardButton("📰 Получить новости", callback_data='get_news')],
+    [InlineKeyboardButton("📁 Управление папками", callback_data='manage_folders')],
+    [InlineKeyboardButton("➕ Добавить канал", callback_data='add_channel'), InlineKeyboardButton("➖ Удалить канал", callback_data='remove_channel')],
+    [InlineKeyboardButton("📋 Список каналов", callback_data='list_channels')],
+    [InlineKeyboardButton("⏰ Время", callback_data='time_interval'), InlineKeyboardButton("📊 Новости", callback_data='news_count')],
+    [InlineKeyboardButton("🔥Лента новостей", callback_data='news_feed')],
+    [InlineKeyboardButton("⭐️ Для владельцев каналов", callback_data='for_channel_owners')],
+    [InlineKeyboardButton("🗑️ Удалить все каналы", callback_data='remove_all')]
+])
+
+
 def create_persistent_keyboard():
-    """Create the persistent keyboard with a single 'Return to menu' button."""
-    keyboard = [
-        [KeyboardButton("🏠 Вернуться в меню")]
-    ]
-    return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, one_time_keyboard=False)
+    """Return the persistent keyboard with a single 'Return to menu' button."""
+    return _PERSISTENT_KEYBOARD
 
 
 def create_main_menu():
-    """Create the main menu keyboard with folder management."""
-    keyboard = [
-        [InlineKeyboardButton("✨ Начать", callback_data='start_plans')],
-        [InlineKeyboardButton("📰 Получить новости", callback_data='get_news')],
-        [InlineKeyboardButton("📁 Управление папками", callback_data='manage_folders')],
-        [InlineKeyboardButton("➕ Добавить канал", callback_data='add_channel'), InlineKeyboardButton("➖ Удалить канал", callback_data='remove_channel')],
-        [InlineKeyboardButton("📋 Список каналов", callback_data='list_channels')],
-        [InlineKeyboardButton("⏰ Время", callback_data='time_interval'), InlineKeyboardButton("📊 Новости", callback_data='news_count')],
-        [InlineKeyboardButton("🔥Лента новостей", callback_data='news_feed')],
-        [InlineKeyboardButton("⭐️ Для владельцев каналов", callback_data='for_channel_owners')],
-        [InlineKeyboardButton("🗑️ Удалить все каналы", callback_data='remove_all')]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    """Return the main menu keyboard with folder management."""
+    return _MAIN_MENU
+
+
+# Fixed reply texts, defined once at import time.
+_WELCOME_MESSAGE = (
+    "⭐️ Здравствуйте, я ваш личный доставщик новостей!\n"
+    "• Не хватает времени прочитать все telegram каналы?\n"
+    "• Устали читать одну и туже новость в разных каналах?\n"
+    "• Информационный шум вызывает тревожность?\n\n"
+    "💻 Я предлагаю:\n"
+    "• Экономить 80% вашего времени\n"
+    "• Выделять ключевые моменты новостей\n"
+    "• Объединять повторяющаяся посты из каналов\n"
+    "• Создавать уникальную ленту новостей\n"
+    "• Все это абсолютно бесплатно\n\n"
+    "📖 Каналы по одной теме = залог хороших новостей!"
+)
+
+_HELP_MESSAGE = (
+    "🤖 Доступные команды:\n\n"
+    "/start - Показать главное меню с кнопками\n"
+    "/help - Показать это сообщение помощи\n\n"
+    "📋 Главное меню включает:\n"
+    "• ➕ Добавить канал\n"
+    "• ➖ Удалить канал\n"
+    "• 📋 Список каналов\n"
+    "• ⏰ Временной диапазон\n"
+    "• 📊 Количество новостей\n"
+    "• 📰 Получить новости\n"
+    "• ⭐️ Для владельцев каналов\n"
+    "• 🗑️ Удалить все каналы\n\n"
+    "💡 Совет: Используйте /start для доступа к меню с кнопками!"
+)
+
+_MAIN_MENU_MESSAGE = (
+    "🏠 Главное меню\n\n"
+    "Выберите действие из меню ниже:"
+)
+
+
+def reset_initialized_users() -> None:
+    """Forget which users have a record, e.g. after user data was replaced by a backup."""
+    _initialized_users.clear()
+
+
+async def _ensure_user_initialized(user_id: int) -> None:
+    """Create the default user record (with Папка1) if the user has none yet."""
+    storage = get_storage()
+    data = await storage.load_user_data()
+    user_id_str = str(user_id)
+    if user_id_str in data:
+        return
+
+    data[user_id_str] = {
+        'folders': {
+            'Папка1': []
+        },
+        'active_folder': 'Папка1',
+        'time_limit': DEFAULT_NEWS_TIME_LIMIT_HOURS,
+        'max_summary_posts': DEFAULT_MAX_SUMMARY_POSTS,
+        'news_requests': {}
+    }
+    await storage.save_user_data(data)
+    logger.info("Created Папка1 for new user %s", user_id)
 
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command."""
-    storage = StorageService()
+    user_id, username = get_user_identity(update)
+    logger.info("User %s started the bot.", user_id)
+    user_logger.info("User_%s (@%s) clicked /start", user_id, username)
 
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    logger.info(f"User {user_id} started the bot.")
-    user_logger.info(f"User_{user_id} (@{username}) clicked /start")
+    # Initialize user with Папка1 if new user (skip the load for users already seen by this process)
+    if user_id not in _initialized_users:
+        await _ensure_user_initialized(user_id)
+        _initialized_users.add(user_id)
 
-    # Initialize user with Папка1 if new user
-    data = await storage.load_user_data()
-    user_id_str = str(user_id)
-    if user_id_str not in data:
-        data[user_id_str] = {
-            'folders': {
-                'Папка1': []
-            },
-            'active_folder': 'Папка1',
-            'time_limit': DEFAULT_NEWS_TIME_LIMIT_HOURS,
-            'max_summary_posts': DEFAULT_MAX_SUMMARY_POSTS,
-            'news_requests': {}
-        }
-        await storage.save_user_data(data)
-        logger.info(f"Created Папка1 for new user {user_id}")
-
-    welcome_message = (
-        "⭐️ Здравствуйте, я ваш личный доставщик новостей!\n"
-        "• Не хватает времени прочитать все telegram каналы?\n"
-        "• Устали читать одну и туже новость в разных каналах?\n"
-        "• Информационный шум вызывает тревожность?\n\n"
-         "💻 Я предлагаю:\n"
-        "• Экономить 80% вашего времени\n"
-        "• Выделять ключевые моменты новостей\n"
-        "• Объединять повторяющаяся посты из каналов\n"
-        "• Создавать уникальную ленту новостей\n"
-        "• Все это абсолютно бесплатно\n\n"
-        "📖 Каналы по одной теме = залог хороших новостей!"
-    )
-
-    inline_markup = create_main_menu()
-    await _send_reply(update, welcome_message, reply_markup=inline_markup)
+    await _send_reply(update, _WELCOME_MESSAGE, reply_markup=_MAIN_MENU)
+    return ConversationHandler.END
 
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    user_logger.info(f"User_{user_id} (@{username}) clicked /help")
-
-    help_text = (
-        "🤖 Доступные команды:\n\n"
-        "/start - Показать главное меню с кнопками\n"
-        "/help - Показать это сообщение помощи\n\n"
-        "📋 Главное меню включает:\n"
-        "• ➕ Добавить канал\n"
-        "• ➖ Удалить канал\n"
-        "• 📋 Список каналов\n"
-        "• ⏰ Временной диапазон\n"
-        "• 📊 Количество новостей\n"
-        "• 📰 Получить новости\n"
-        "• ⭐️ Для владельцев каналов\n"
-        "• 🗑️ Удалить все каналы\n\n"
-        "💡 Совет: Используйте /start для доступа к меню с кнопками!"
-    )
-    await _send_reply(update, help_text)
+    user_id, username = get_user_identity(update)
+    user_logger.info("User_%s (@%s) clicked /help", user_id, username)
+
+    await _send_reply(update, _HELP_MESSAGE)
 
 
 async def handle_return_to_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle the persistent 'Return to menu' button press."""
-    user_id = update.effective_user.id
-    username = update.effective_user.username or "unknown"
-    user_logger.info(f"User_{user_id} (@{username}) clicked persistent 'Return to menu' button")
-
-    welcome_message = (
-        "🏠 Главное меню\n\n"
-        "Выберите действие из меню ниже:"
-    )
+    user_id, username = get_user_identity(update)
+    user_logger.info("User_%s (@%s) clicked persistent 'Return to menu' button", user_id, username)
 
-    reply_markup = create_main_menu()
-    await _send_reply(update, welcome_message, reply_markup=reply_markup)
+    await _send_reply(update, _MAIN_MENU_MESSAGE, reply_markup=_MAIN_MENU)
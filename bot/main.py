@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Main bot entry point - Application initialization and handler registration."""
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -8,9 +9,20 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ConversationHandler, filters
-
-from bot.utils.config import TELEGRAM_BOT_API, ADMIN_CHAT_ID_LOG_INT, ENABLE_RATE_LIMITED_QUEUE
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ConversationHandler, TypeHandler, filters
+
+from bot.utils.config import (
+    TELEGRAM_BOT_API,
+    ADMIN_CHAT_ID_LOG_INT,
+    ENABLE_RATE_LIMITED_QUEUE,
+    POLLING_TIMEOUT_SEC,
+    POLLING_READ_TIMEOUT_SEC,
+    POLLING_CONNECT_TIMEOUT_SEC,
+    CONCURRENT_UPDATES,
+    BOT_CONNECTION_POOL_SIZE,
+    BOT_POOL_TIMEOUT_SEC,
+    CONVERSATION_TIMEOUT_SEC,
+)
 from bot.utils.logger import setup_logging
 
 # Import all handlers
@@ -19,6 +31,7 @@ from bot.handlers import (
     start_command,
     help_command,
     handle_return_to_menu,
+    handle_conversation_timeout,
     news_command,
     add_channel_command,
     remove_channel_command,
@@ -30,6 +43,8 @@ from bot.handlers import (
     log_command,
     # Conversation handlers
     button_callback,
+    start_admin_notifier,
+    stop_admin_notifier,
     handle_add_channel_input,
     handle_remove_channel_input,
     handle_time_interval_input,
@@ -57,7 +72,7 @@ from bot.handlers import (
 )
 
 # Import services for cleanup
-from bot.services import ScraperService
+from bot.handlers.shared import get_scraper
 from bot.services.rate_limiter import RateLimiter
 from bot.services import messenger as messenger_service
 
@@ -67,6 +82,35 @@ logger, user_logger = setup_logging(
     admin_chat_id=ADMIN_CHAT_ID_LOG_INT
 )
 
+# Filters shared by every handler registration (built once, evaluated per update)
+TEXT_NOT_COMMAND = filters.TEXT & ~filters.COMMAND
+RETURN_TO_MENU_FILTER = filters.Text({"🏠 Вернуться в меню"})
+
+# Text input handler for each conversation state that waits for a typed reply
+TEXT_INPUT_HANDLERS = {
+    WAITING_FOR_CHANNEL_ADD: handle_add_channel_input,
+    WAITING_FOR_CHANNEL_REMOVE: handle_remove_channel_input,
+    WAITING_FOR_TIME_INTERVAL: handle_time_interval_input,
+    WAITING_FOR_NEWS_COUNT: handle_news_count_input,
+    WAITING_FOR_ADD_TO_FEED_CHANNEL: handle_add_to_feed_channel,
+    WAITING_FOR_ADD_TO_FEED_DESCRIPTION: handle_add_to_feed_description,
+    WAITING_FOR_REMOVE_FROM_FEED_CHANNEL: handle_remove_from_feed_channel,
+    WAITING_FOR_REMOVE_FROM_FEED_REASON: handle_remove_from_feed_reason,
+    WAITING_FOR_RESTRICT_ACCESS_CHANNEL: handle_restrict_access_channel,
+    WAITING_FOR_RESTRICT_ACCESS_REASON: handle_restrict_access_reason,
+    WAITING_FOR_NEW_FOLDER_NAME: handle_new_folder_name,
+}
+
+# Conversation states are built once; the handler instances are reused by every application
+_CONV_STATES = {
+    **{
+        state: [MessageHandler(TEXT_NOT_COMMAND, handler)]
+        for state, handler in TEXT_INPUT_HANDLERS.items()
+    },
+    WAITING_FOR_ADD_TO_FEED_HASHTAG: [CallbackQueryHandler(button_callback)],
+    ConversationHandler.TIMEOUT: [TypeHandler(Update, handle_conversation_timeout)],
+}
+
 
 def create_application():
     """Create and configure the Telegram bot application.
@@ -76,12 +120,13 @@ def create_application():
     """
     logger.info("Creating bot application...")
 
-    # Initialize scraper service for cleanup
-    scraper = ScraperService()
+    # Shared scraper service, closed on shutdown
+    scraper = get_scraper()
     rate_limiter: RateLimiter | None = None
 
     async def on_startup(app: Application) -> None:
         nonlocal rate_limiter
+        start_admin_notifier()
         if not ENABLE_RATE_LIMITED_QUEUE:
             messenger_service.configure(bot=app.bot, rate_limiter=None)
             return
@@ -90,69 +135,45 @@ def create_application():
         messenger_service.configure(bot=app.bot, rate_limiter=rate_limiter)
         await rate_limiter.start()
 
-    async def on_shutdown(app: Application) -> None:
+    async def on_stop(app: Application) -> None:
+        # Runs before Application.shutdown(), while app.bot can still send:
+        # flush pending admin notifications, then drain the rate limiter
         try:
+            await stop_admin_notifier()
+        finally:
             if ENABLE_RATE_LIMITED_QUEUE and rate_limiter is not None:
                 await rate_limiter.stop()
-        finally:
-            await scraper.close_http_client()
+
+    async def on_shutdown(app: Application) -> None:
+        await scraper.close_http_client()
 
     # Create application
     application = (
         Application.builder()
         .token(TELEGRAM_BOT_API)
+        .concurrent_updates(CONCURRENT_UPDATES)
+        .connection_pool_size(BOT_CONNECTION_POOL_SIZE)
+        .pool_timeout(BOT_POOL_TIMEOUT_SEC)
+        .get_updates_read_timeout(POLLING_READ_TIMEOUT_SEC)
+        .get_updates_connect_timeout(POLLING_CONNECT_TIMEOUT_SEC)
         .post_init(on_startup)
+        .post_stop(on_stop)
         .post_shutdown(on_shutdown)
         .build()
     )
 
     # Create conversation handler for button interactions
+    # /start opens the menu from anywhere and also ends an unfinished conversation
+    start_handler = CommandHandler('start', start_command)
     conv_handler = ConversationHandler(
-        entry_points=[CallbackQueryHandler(button_callback)],
-        states={
-            WAITING_FOR_CHANNEL_ADD: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_add_channel_input)
-            ],
-            WAITING_FOR_CHANNEL_REMOVE: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_remove_channel_input)
-            ],
-            WAITING_FOR_TIME_INTERVAL: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_time_interval_input)
-            ],
-            WAITING_FOR_NEWS_COUNT: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_news_count_input)
-            ],
-            WAITING_FOR_ADD_TO_FEED_CHANNEL: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_add_to_feed_channel)
-            ],
-            WAITING_FOR_ADD_TO_FEED_HASHTAG: [
-                CallbackQueryHandler(button_callback)
-            ],
-            WAITING_FOR_ADD_TO_FEED_DESCRIPTION: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_add_to_feed_description)
-            ],
-            WAITING_FOR_REMOVE_FROM_FEED_CHANNEL: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_remove_from_feed_channel)
-            ],
-            WAITING_FOR_REMOVE_FROM_FEED_REASON: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_remove_from_feed_reason)
-            ],
-            WAITING_FOR_RESTRICT_ACCESS_CHANNEL: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_restrict_access_channel)
-            ],
-            WAITING_FOR_RESTRICT_ACCESS_REASON: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_restrict_access_reason)
-            ],
-            WAITING_FOR_NEW_FOLDER_NAME: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_new_folder_name)
-            ],
-        },
-        fallbacks=[CommandHandler('start', start_command)],
-        allow_reentry=True
+        entry_points=[start_handler, CallbackQueryHandler(button_callback)],
+        states=_CONV_STATES,
+        fallbacks=[start_handler],
+        allow_reentry=True,
+        conversation_timeout=CONVERSATION_TIMEOUT_SEC
     )
 
-    # Register handlers
-    application.add_handler(CommandHandler("start", start_command))
+    # Register handlers (/start is handled by the conversation handler)
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("restore_backup", restore_backup_command))
     application.add_handler(CommandHandler("log", log_command))
@@ -168,22 +189,45 @@ def create_application():
     application.add_handler(CommandHandler("news", news_command))
 
     # Handler for persistent keyboard button
-    application.add_handler(MessageHandler(filters.Text(["🏠 Вернуться в меню"]), handle_return_to_menu))
+    application.add_handler(MessageHandler(RETURN_TO_MENU_FILTER, handle_return_to_menu))
 
     logger.info("Bot application created successfully")
     return application
 
 
+def _install_uvloop() -> None:
+    """Use uvloop as the asyncio event loop when it is available."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 def main():
     """Start the bot."""
     logger.info("Starting bot...")
+    _install_uvloop()
 
     # Create and configure application
     application = create_application()
 
     # Start the bot
     logger.info("Bot started successfully. Running polling...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Long polling: Telegram holds getUpdates open until an update arrives,
+    # stale updates queued while the bot was offline are dropped on boot.
+    # Only subscribe to the update kinds the registered handlers consume.
+    application.run_polling(
+        allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+        timeout=POLLING_TIMEOUT_SEC,
+        poll_interval=0.0,
+        bootstrap_retries=-1,
+        drop_pending_updates=True,
+    )
 
 
 if __name__ == '__main__':
@@ -7,6 +7,9 @@ import re
 from typing import Dict, List, Tuple
 from bot.utils.config import MAX_NEWS_TIME_LIMIT_HOURS, MAX_SUMMARY_POSTS_LIMIT
 
+# Date keys of the per-day news request counter (YYYY-MM-DD)
+_DATE_KEY_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
 
 def migrate_user_data_to_folders(data: dict) -> dict:
     """Migrate old user data format to new folder-based format.
@@ -104,7 +107,7 @@ def validate_user_data(data: dict) -> Tuple[bool, List[str]]:
                 errors.append(f'User {user_id}: "news_requests" must be a dictionary.')
             else:
                 for date_key, count in news_requests.items():
-                    if not isinstance(date_key, str) or not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date_key):
+                    if not isinstance(date_key, str) or not _DATE_KEY_PATTERN.fullmatch(date_key):
                         errors.append(f'User {user_id}: invalid news_requests date key {date_key!r}.')
                     if not isinstance(count, int) or count < 0:
                         errors.append(f'User {user_id}: invalid news_requests count {count!r} for {date_key!r}.')
@@ -92,12 +92,28 @@ MAX_NEWS_TIME_LIMIT_HOURS: int = 168  # Maximum allowed time range (7 days)
 DEFAULT_MAX_SUMMARY_POSTS: int = 5  # Default number of news summaries
 MAX_SUMMARY_POSTS_LIMIT: int = 15  # Maximum allowed summaries
 MAX_NEWS_REQUESTS_PER_DAY: int = 3  # Rate limit for /news command
+SCRAPE_CONCURRENT_LIMIT: int = _get_int_env('SCRAPE_CONCURRENT_LIMIT', 8)  # Channels scraped at once (bot-wide)
 
 # Rate limiter defaults
 GLOBAL_RATE_MESSAGES_PER_SEC: int = 30
 PER_CHAT_COOLDOWN_SEC: float = 1.0
 HEAVY_LOAD_DELAY_THRESHOLD_SEC: float = 3.0
 
+# Long polling settings (read timeout must exceed the long-poll timeout)
+POLLING_TIMEOUT_SEC: int = 50
+POLLING_READ_TIMEOUT_SEC: float = POLLING_TIMEOUT_SEC + 5
+POLLING_CONNECT_TIMEOUT_SEC: float = 10.0
+
+# Maximum number of updates processed concurrently by the dispatcher
+CONCURRENT_UPDATES: int = _get_int_env('CONCURRENT_UPDATES', 256)
+
+# HTTP connection pool for Bot API calls (sized to the dispatcher's concurrency)
+BOT_CONNECTION_POOL_SIZE: int = _get_int_env('BOT_CONNECTION_POOL_SIZE', CONCURRENT_UPDATES)
+BOT_POOL_TIMEOUT_SEC: float = 20.0  # How long a request waits for a free pooled connection
+
+# Idle conversations (unfinished forms) are ended after this many seconds
+CONVERSATION_TIMEOUT_SEC: int = _get_int_env('CONVERSATION_TIMEOUT_SEC', 900)
+
 # Rollout feature flags
 ENABLE_RATE_LIMITED_QUEUE: bool = os.getenv("ENABLE_RATE_LIMITED_QUEUE", "true").lower() in {"1", "true", "yes"}
 
@@ -212,7 +212,7 @@ def setup_logging(bot_token: Optional[str] = None, admin_chat_id: Optional[int]
         root_logger.addHandler(telegram_handler)
         _TELEGRAM_HANDLER = telegram_handler
         _TELEGRAM_CHAT_ID = admin_chat_id
-        logger.info(f"Telegram log notifications configured for chat {admin_chat_id}")
+        logger.info("Telegram log notifications configured for chat %s", admin_chat_id)
 
     # Create separate logger for user interactions once
     user_logger = logging.getLogger("user_interactions")
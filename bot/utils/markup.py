@@ -0,0 +1,40 @@
+"""
+Keyboard markup helpers shared by the handler modules.
+
+Static menus are sent on nearly every interaction. python-telegram-bot turns
+each reply markup into a dict via ``to_dict()`` before JSON-encoding the
+request, so keyboards that never change can serialize themselves once and hand
+back the same payload on every send.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+
+class CachedInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """InlineKeyboardMarkup that memoizes its serialized form.
+
+    The dict returned by :meth:`to_dict` is computed once in ``__init__`` and
+    shared between calls, so callers must treat it as read-only (PTB only
+    JSON-encodes it).
+    """
+
+    __slots__ = ("_cached_dict",)
+
+    def __init__(
+        self,
+        inline_keyboard: Sequence[Sequence[InlineKeyboardButton]],
+        *,
+        api_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(inline_keyboard, api_kwargs=api_kwargs)
+        # Underscore attributes may be set on frozen Telegram objects.
+        self._cached_dict = super().to_dict()
+
+    def to_dict(self, recursive: bool = True) -> Dict[str, Any]:
+        if not recursive:
+            return super().to_dict(recursive=False)
+        return self._cached_dict
@@ -0,0 +1,29 @@
+"""
+Helpers for reading the Telegram user behind an update.
+
+Handlers log every action as ``User_<id> (@<username>)``; this module keeps the
+id/username lookup and the ``"unknown"`` fallback in one place.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+from telegram import Update
+
+UNKNOWN_USERNAME = "unknown"
+
+
+def get_user_identity(update: Update) -> Tuple[int, str]:
+    """
+    Return the id and username of the user who sent the update.
+
+    Args:
+        update: The incoming Telegram update.
+
+    Returns:
+        A ``(user_id, username)`` tuple; users without a Telegram username get
+        ``"unknown"``.
+    """
+    user = update.effective_user
+    return user.id, user.username or UNKNOWN_USERNAME
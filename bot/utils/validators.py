@@ -42,7 +42,7 @@ def validate_channel_name(name: str) -> str:
     lower_candidate = candidate.lower()
     slug: str
 
-    if any(lower_candidate.startswith(prefix) for prefix in _TME_PREFIXES):
+    if lower_candidate.startswith(_TME_PREFIXES):
         slug = candidate.split("/", 1)[1].strip().strip("/")
         if not slug:
             raise ValueError("Ссылка на канал должна содержать название канала.")